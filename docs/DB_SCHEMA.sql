@@ -32,7 +32,7 @@ CREATE TABLE IF NOT EXISTS achievement_grants (
     session_id TEXT,
     rarity TEXT NOT NULL,
     awarded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    detail JSON,
+    detail BLOB, -- compact JSON; some older rows hold msgpack
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
     FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE
 );
@@ -43,6 +43,12 @@ CREATE INDEX IF NOT EXISTS idx_achievement_grants_user
 CREATE INDEX IF NOT EXISTS idx_achievement_grants_session
     ON achievement_grants (achievement_id, session_id, awarded_at DESC);
 
+CREATE INDEX IF NOT EXISTS idx_achievement_grants_user_session
+    ON achievement_grants (achievement_id, user_id, session_id, awarded_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_achievement_grants_user_recent
+    ON achievement_grants (user_id, awarded_at DESC);
+
 CREATE TABLE IF NOT EXISTS event_log (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     user_id TEXT NOT NULL,
@@ -79,7 +85,7 @@ CREATE TABLE IF NOT EXISTS story_profiles (
 CREATE TABLE IF NOT EXISTS story_state (
     session_id TEXT PRIMARY KEY,
     current_scene TEXT,
-    scene_history JSON,
+    scene_history TEXT, -- scene ids joined by U+001F; legacy rows hold a JSON array
     flags JSON,
     stats JSON,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -93,11 +99,14 @@ CREATE TABLE IF NOT EXISTS story_rolls (
     user_id TEXT NOT NULL,
     expression TEXT NOT NULL,
     result_total INTEGER NOT NULL,
-    result_detail JSON,
+    result_detail BLOB,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_story_rolls_session
-    ON story_rolls (session_id, created_at DESC);
+-- Superseded by idx_story_rolls_session_recent, which also covers the id tiebreak.
+DROP INDEX IF EXISTS idx_story_rolls_session;
+
+CREATE INDEX IF NOT EXISTS idx_story_rolls_session_recent
+    ON story_rolls (session_id, created_at DESC, id DESC);
@@ -577,7 +577,7 @@ class TelegramBot:
         session_id = f"telegram:{update.effective_chat.id if update.effective_chat else 'unknown'}"
         display_name = update.effective_user.full_name if update.effective_user else None
 
-        session_state = self._ensure_session(session_id, user_id)
+        session_state, created = self._ensure_session(session_id, user_id)
         mode = session_state.mode
         overrides = session_overrides or {}
         if "mode" in overrides:
@@ -590,7 +590,7 @@ class TelegramBot:
             base_metadata["session_overrides"] = overrides
 
         normalized_triggers = tuple(triggers)
-        if session_state.created_at == session_state.updated_at and "event.message.first_contact" not in normalized_triggers:
+        if created and "event.message.first_contact" not in normalized_triggers:
             normalized_triggers = ("event.message.first_contact",) + normalized_triggers
 
         request = ModeRequest(
@@ -607,13 +607,14 @@ class TelegramBot:
         await effective_message.reply_text(response.text)
         await self._maybe_send_sound(effective_message, response, normalized_triggers)
 
-    def _ensure_session(self, session_id: str, user_id: str) -> SessionState:
+    def _ensure_session(self, session_id: str, user_id: str) -> tuple[SessionState, bool]:
+        """Return the session and whether this call created it."""
         state = self.store.get_session(session_id)
         if state:
-            return state
+            return state, False
         # Ensure a user row exists before creating a session to satisfy FK constraints.
         self.store.ensure_user(user_id)
-        return self.store.upsert_session(session_id, user_id)
+        return self.store.upsert_session(session_id, user_id), True
 
     def _character_summary(self, profile, story_ready: bool) -> str:
         summary = self.character_manager.render_profile(profile)
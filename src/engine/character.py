@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import random
+from bisect import bisect_right
 from dataclasses import dataclass
 from typing import Dict, Optional
 
-from .storage import SQLiteStore, StoryProfile, StoryState
+from .storage import ABILITY_KEYS, SQLiteStore, StoryProfile, StoryState
 
-ABILITY_KEYS = ("str", "dex", "con", "int", "wis", "cha")
+# "STR {}, DEX {}, ..." filled positionally from StoryProfile.ability_row.
+ABILITY_LINE_TEMPLATE = ", ".join(f"{key.upper()} {{}}" for key in ABILITY_KEYS)
 XP_THRESHOLDS = [
     0,
     300,
@@ -271,13 +273,8 @@ def ability_modifier(score: int) -> int:
 
 
 def level_from_xp(xp: int) -> int:
-    level = 1
-    for index, threshold in enumerate(XP_THRESHOLDS, start=1):
-        if xp >= threshold:
-            level = index
-        else:
-            break
-    return max(1, level)
+    # Thresholds are sorted, so the count of those reached is the level.
+    return max(1, bisect_right(XP_THRESHOLDS, xp))
 
 
 def profile_ready(profile: StoryProfile) -> bool:
@@ -302,6 +299,7 @@ __all__ = [
     "profile_ready",
     "required_fields_missing",
     "ABILITY_KEYS",
+    "ABILITY_LINE_TEMPLATE",
     "SUPPORTED_RACES",
     "SUPPORTED_CLASSES",
     "XP_THRESHOLDS",
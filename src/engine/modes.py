@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass, field
-from typing import Any, Optional, Sequence, Tuple
+from functools import cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence, Tuple
 
 from ..agents.dmk_agent import (
     AgentError,
@@ -20,24 +23,24 @@ from ..engine.achievements import (
     load_registry,
 )
 from ..engine.storage import SQLiteStore, SessionState
-from .character import profile_ready
+from .character import ABILITY_LINE_TEMPLATE, profile_ready
 from .story import StoryEngine, StoryTurnResult
 from ..utils.formatting import format_achievement_block
 
 
-AUTO_CHECK_TAGS = {
-    "chaos": ("cha", 12),
-    "risk": ("dex", 12),
-    "puzzle": ("int", 13),
-    "stealth": ("dex", 13),
-    "social": ("cha", 12),
-    "ally": ("cha", 11),
-    "exploration": ("wis", 11),
-    "combat": ("str", 14),
-    "magic": ("int", 14),
-    "inventory": ("wis", 10),
-    "shortcut": ("dex", 12),
-}
+_OFFLINE_PARAGRAPH_ERROR = (
+    "Keith whacks the oracle crystal—silence. The uplink is down, so you're getting handcrafted narration instead."
+)
+_OFFLINE_PARAGRAPH_OK = (
+    "Keith flexes his narrator cape and assures you the immersion field is still operational even without the grand oracle."
+)
+_OFFLINE_RECAP_PREFIX = "He recaps the moment manually so future historians don't miss a beat:\n"
+# toggle_snapshot in handle() always carries exactly these keys.
+_OFFLINE_RETRY_TEMPLATE = (
+    "Consider trying the command again after a short rest. "
+    "(toggles: profanity_level={profanity_level}, rating={rating}, "
+    "tangents_level={tangents_level}, achievement_density={achievement_density})"
+)
 
 DEFAULT_NARRATION_ACHIEVEMENT = Achievement(
     id="narration-only",
@@ -52,6 +55,18 @@ DEFAULT_NARRATION_ACHIEVEMENT = Achievement(
 )
 
 
+@cache
+def _cached_registry() -> tuple[tuple[Achievement, ...], Mapping[str, Achievement]]:
+    """Return the registry and a read-only id index shared by every router.
+
+    Call ``_cached_registry.cache_clear()`` (after ``load_registry.cache_clear()``)
+    to pick up registry edits.
+    """
+    registry = load_registry()
+    index = MappingProxyType({achievement.id: achievement for achievement in registry})
+    return registry, index
+
+
 @dataclass(frozen=True)
 class ModeRequest:
     user_id: str
@@ -86,8 +101,8 @@ class ModeRouter:
         self.settings = settings or get_settings()
         self.store = store or SQLiteStore()
         self.agent = agent or DMKAgent(self.settings)
-        self._registry = load_registry()
-        self._registry_index = {achievement.id: achievement for achievement in self._registry}
+        self._registry, self._registry_index = _cached_registry()
+        self._block_cache: dict[str, str] = {}
         self.story_engine = StoryEngine(self.store)
 
     def handle(self, request: ModeRequest) -> ModeResponse:
@@ -133,11 +148,9 @@ class ModeRouter:
                 attachments.append(story_context)
             attachments.extend(story_turn.attachments)
             agent_message = story_turn.agent_message
-            combined_triggers = list(triggers)
-            for trig in story_turn.triggers:
-                if trig not in combined_triggers:
-                    combined_triggers.append(trig)
-            triggers = tuple(combined_triggers)
+            combined_triggers = dict.fromkeys(triggers)
+            combined_triggers.update(dict.fromkeys(story_turn.triggers))
+            triggers = tuple(combined_triggers)  # preserve order, dedupe
             metadata.setdefault("story", {}).update(story_turn.metadata or {})
 
         should_award = self._should_award(session_state, request, story_turn)
@@ -167,7 +180,7 @@ class ModeRouter:
         else:
             achievement = None
 
-        block = format_achievement_block(achievement) if achievement else ""
+        block = self._format_block(achievement) if achievement else ""
         toggle_snapshot = {
             "profanity_level": session_state.profanity_level,
             "rating": session_state.rating,
@@ -193,6 +206,14 @@ class ModeRouter:
             trigger=trigger_used,
         )
 
+    def _format_block(self, achievement: Achievement) -> str:
+        """Return the achievement block, rendering each registry entry once."""
+        block = self._block_cache.get(achievement.id)
+        if block is None:
+            block = format_achievement_block(achievement)
+            self._block_cache[achievement.id] = block
+        return block
+
     def _generate_body(
         self,
         *,
@@ -244,28 +265,12 @@ class ModeRouter:
     ) -> str:
         """Fallback when the OpenAI client is unavailable."""
         sanitized = message.strip()
-        toggle_line = ", ".join(
-            f"{key}={value}" for key, value in toggle_snapshot.items()
-        )
-        if error_mode:
-            paragraph_one = (
-                "Keith whacks the oracle crystal—silence. The uplink is down, so you're getting handcrafted narration instead."
-            )
-        else:
-            paragraph_one = (
-                "Keith flexes his narrator cape and assures you the immersion field is still operational even without the grand oracle."
-            )
+        paragraph_one = _OFFLINE_PARAGRAPH_ERROR if error_mode else _OFFLINE_PARAGRAPH_OK
         if context:
-            paragraph_two = (
-                "He recaps the moment manually so future historians don't miss a beat:\n"
-                f"{context}"
-            )
+            paragraph_two = _OFFLINE_RECAP_PREFIX + context
         else:
             paragraph_two = "He at least jots down your words for later: " + (sanitized or "[no input]")
-        paragraph_three = (
-            "Consider trying the command again after a short rest. "
-            f"(toggles: {toggle_line})"
-        )
+        paragraph_three = _OFFLINE_RETRY_TEMPLATE.format_map(toggle_snapshot)
         return f"{paragraph_one}\n\n{paragraph_two}\n\n{paragraph_three}"
 
     def _fallback_achievement(self, user_id: str) -> Achievement:
@@ -281,37 +286,35 @@ class ModeRouter:
     def _story_context_text(self, profile, story_turn) -> Optional[str]:
         if not story_turn or not profile:
             return None
-        order = ["str", "dex", "con", "int", "wis", "cha"]
-        ability_summary = ", ".join(
-            f"{ability.upper()} {profile.ability_scores.get(ability, 10)}"
-            for ability in order
-        )
-        lines = [
-            f"Character: {profile.character_name or 'Unnamed'} (Level {profile.level}, XP {profile.experience})",
-            f"Race/Class: {profile.race or 'Unknown'} / {profile.character_class or 'Untrained'}",
-            f"Abilities: {ability_summary}",
-            f"Current scene: {story_turn.scene.id} — {story_turn.scene.title}",
-        ]
-        if story_turn.selected_choice:
-            choice = story_turn.selected_choice
-            lines.append(f"Selected choice: {choice.id} ({choice.label})")
+        scene = story_turn.scene
+        abilities = ABILITY_LINE_TEMPLATE.format(*profile.ability_row)
+        choice = story_turn.selected_choice
+        choice_line = f"\nSelected choice: {choice.id} ({choice.label})" if choice else ""
+        check_line = ""
         if story_turn.check_outcome:
             outcome = story_turn.check_outcome
             status = "success" if outcome.success else "failure"
             manual = " (manual)" if outcome.manual else ""
             auto = " (auto)" if story_turn.auto_generated_check and not outcome.manual else ""
             note = story_turn.metadata.get("check", {}).get("note") if getattr(story_turn, "metadata", None) else None
-            base_line = (
-                f"Check: {outcome.ability.upper()}{manual}{auto} {status} — rolls {list(outcome.kept)} total {outcome.total} vs DC {outcome.difficulty_class}"
+            note_suffix = f" ({note})" if note else ""
+            check_line = (
+                f"\nCheck: {outcome.ability.upper()}{manual}{auto} {status} — rolls {list(outcome.kept)}"
+                f" total {outcome.total} vs DC {outcome.difficulty_class}{note_suffix}"
+            )
+        choices_block = ""
+        if scene.choices:
+            choices_block = "\nChoices:\n" + "\n".join(
+                f"  {idx}. {option.label} (id={option.id})"
+                for idx, option in enumerate(scene.choices, start=1)
             )
-            if note:
-                base_line += f" ({note})"
-            lines.append(base_line)
-        if story_turn.scene.choices:
-            lines.append("Choices:")
-            for idx, option in enumerate(story_turn.scene.choices, start=1):
-                lines.append(f"  {idx}. {option.label} (id={option.id})")
-        return "\n".join(lines)
+        return (
+            f"Character: {profile.character_name or 'Unnamed'} (Level {profile.level}, XP {profile.experience})\n"
+            f"Race/Class: {profile.race or 'Unknown'} / {profile.character_class or 'Untrained'}\n"
+            f"Abilities: {abilities}\n"
+            f"Current scene: {scene.id} — {scene.title}"
+            f"{choice_line}{check_line}{choices_block}"
+        )
 
     def _should_award(
         self,
@@ -338,21 +341,20 @@ class ModeRouter:
         density = session_state.achievement_density or "normal"
         probabilities = {"low": 0.25, "normal": 0.55, "high": 0.85}
         probability = probabilities.get(density, 0.55)
-        seed = hash(
-            (
-                request.user_id,
-                request.session_id,
-                session_state.mode,
-                message_text,
-            )
-        ) & 0xFFFF
-        roll = seed / 0xFFFF
+        # blake2b keeps the roll stable across processes, unlike hash().
+        digest = hashlib.blake2b(
+            "\x00".join(
+                (request.user_id, request.session_id, session_state.mode, message_text)
+            ).encode("utf-8"),
+            digest_size=2,
+        ).digest()
+        roll = int.from_bytes(digest, "big") / 0xFFFF
         return roll < probability
 
 
     def _empty_story_response(self, request: ModeRequest, mode: AllowedMode) -> ModeResponse:
         achievement = self._registry_index.get("session-zero-hero", self._registry[0])
-        block = format_achievement_block(achievement)
+        block = self._format_block(achievement)
         body = (
             "Keith flips the script and admits the scene isn't ready yet. Reply with a number or keyword to pick an option."
         )
@@ -366,7 +368,7 @@ class ModeRouter:
 
     def _story_setup_response(self, request: ModeRequest, mode: AllowedMode) -> ModeResponse:
         achievement = self._registry_index.get("session-zero-hero", self._registry[0])
-        block = format_achievement_block(achievement)
+        block = self._format_block(achievement)
         body = (
             "Keith taps the storybook closed. Before we dive into the saga, "
             "run `/character` to finish crafting your persona and then `/character finalize`."
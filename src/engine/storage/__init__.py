@@ -1,6 +1,7 @@
 """Storage utilities."""
 
 from .sqlite import (
+    ABILITY_KEYS,
     AchievementGrant,
     SessionState,
     SQLiteStore,
@@ -10,6 +11,7 @@ from .sqlite import (
 )
 
 __all__ = [
+    "ABILITY_KEYS",
     "SQLiteStore",
     "AchievementGrant",
     "SessionState",
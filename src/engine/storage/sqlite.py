@@ -3,19 +3,177 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import queue
 import sqlite3
 import threading
-from dataclasses import dataclass
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional, Sequence
+from typing import Any, Iterator, Optional, Sequence, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    msgpack = None  # type: ignore[assignment]
 
 from ...config.toggles import ensure_database_path, get_settings
 
+logger = logging.getLogger(__name__)
+
+# Matches SQLite's CURRENT_TIMESTAMP text so both kinds of rows sort together.
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 SCHEMA_PATH = Path(__file__).resolve().parents[3] / "docs" / "DB_SCHEMA.sql"
+SEEN_USERS_LIMIT = 4096
+# Most-recently-used session / story_state rows kept in memory per store.
+STATE_CACHE_LIMIT = 1024
+# Group commit: the writer thread folds up to this many queued inserts into one
+# transaction, optionally waiting DMK_SQLITE_COMMIT_DELAY_MS for siblings.
+WRITE_BATCH_SIZE = max(1, int(os.getenv("DMK_SQLITE_WRITE_BATCH", "32")))
+COMMIT_DELAY_SEC = max(0.0, float(os.getenv("DMK_SQLITE_COMMIT_DELAY_MS", "0"))) / 1000
+# scene_history is a flat list of scene ids stored as unit-separator-joined text.
+# Older databases declare the column JSON (NUMERIC affinity), which turns a lone
+# numeric id into an INTEGER, so reads CAST it back to text.
+SCENE_HISTORY_SEP = "\x1f"
+# Read-only connections kept for SELECTs alongside the single writer.
+READ_POOL_SIZE = max(1, int(os.getenv("DMK_SQLITE_READERS", "4")))
+# db_path value for a non-durable database that lives in the writer connection.
+MEMORY_DB_PATH = ":memory:"
+# Ability score keys in character-sheet order; StoryProfile.ability_row follows it.
+ABILITY_KEYS = ("str", "dex", "con", "int", "wis", "cha")
+
+# Statements shared between methods or previously assembled per call. sqlite3
+# keeps a per-connection prepared-statement cache keyed by SQL text, so reusing
+# these exact strings also reuses the compiled statements.
+_GRANT_SELECT = """
+    SELECT id,
+           achievement_id,
+           user_id,
+           session_id,
+           rarity,
+           awarded_at,
+           detail
+    FROM achievement_grants
+"""
+_STATEMENTS = {
+    "insert_grant": """
+        INSERT INTO achievement_grants
+            (achievement_id, user_id, session_id, rarity, awarded_at, detail)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    "latest_grant": _GRANT_SELECT
+    + """
+    WHERE achievement_id = ?
+      AND user_id = ?
+    ORDER BY awarded_at DESC
+    LIMIT 1
+    """,
+    "latest_grant_in_session": _GRANT_SELECT
+    + """
+    WHERE achievement_id = ?
+      AND user_id = ?
+      AND session_id = ?
+    ORDER BY awarded_at DESC
+    LIMIT 1
+    """,
+    "most_recent_grant": _GRANT_SELECT
+    + """
+    WHERE user_id = ?
+    ORDER BY awarded_at DESC
+    LIMIT 1
+    """,
+}
+
+# INSERT ... RETURNING (SQLite 3.35+) hands back the upserted row; older
+# libraries fall back to a read after the write.
+if sqlite3.sqlite_version_info >= (3, 35, 0):
+    _RETURNING = {
+        "sessions": """
+            RETURNING id,
+                      user_id,
+                      mode,
+                      profanity_level,
+                      rating,
+                      tangents_level,
+                      achievement_density,
+                      story_mode_enabled,
+                      created_at,
+                      updated_at
+        """,
+        "story_profiles": """
+            RETURNING session_id,
+                      user_id,
+                      character_name,
+                      pronouns,
+                      race,
+                      character_class,
+                      backstory,
+                      level,
+                      experience,
+                      ability_scores,
+                      inventory,
+                      metadata,
+                      created_at,
+                      updated_at
+        """,
+        "story_state": """
+            RETURNING session_id,
+                      current_scene,
+                      CAST(scene_history AS TEXT),
+                      flags,
+                      stats,
+                      created_at,
+                      updated_at
+        """,
+    }
+else:  # pragma: no cover - depends on the linked SQLite library
+    _RETURNING = {"sessions": "", "story_profiles": "", "story_state": ""}
+
+
+if orjson is not None:
+
+    def _dumps(value: Any) -> bytes:
+        # Match json.dumps, which stringifies int keys instead of raising.
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+else:  # pragma: no cover - exercised only without orjson installed
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
 
+def _pack_payload(value: Any) -> bytes:
+    """Encode a write-once log payload (grant detail, roll detail) for a BLOB column."""
+    # Always JSON, so the file format never depends on which extras are installed.
+    return _dumps(value)
 
-@dataclass(frozen=True)
+
+def _unpack_payload(blob: Any) -> Any:
+    # JSON payloads start with { or [; msgpack maps and arrays never do.
+    if isinstance(blob, str) or blob[:1] in (b"{", b"["):
+        return _loads(blob)
+    if msgpack is None:
+        raise RuntimeError("msgpack is required to read this database's payload columns")
+    # Rows packed by builds that wrote msgpack; round-trip through JSON so int
+    # keys come back as strings, the same shape as every other row.
+    return _loads(_dumps(msgpack.unpackb(blob, strict_map_key=False)))
+
+
+@dataclass(frozen=True, slots=True)
 class AchievementGrant:
     """Representation of a stored achievement grant."""
 
@@ -28,7 +186,7 @@ class AchievementGrant:
     detail: dict[str, Any]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SessionState:
     id: str
     user_id: str
@@ -42,7 +200,7 @@ class SessionState:
     updated_at: datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryProfile:
     session_id: str
     user_id: str
@@ -58,9 +216,17 @@ class StoryProfile:
     metadata: dict[str, Any]
     created_at: datetime
     updated_at: datetime
+    ability_row: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Packed STR..CHA scores (default 10) for hot read paths.
+        scores = self.ability_scores
+        object.__setattr__(
+            self, "ability_row", tuple(scores.get(ability, 10) for ability in ABILITY_KEYS)
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryState:
     session_id: str
     current_scene: Optional[str]
@@ -71,7 +237,7 @@ class StoryState:
     updated_at: datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryRoll:
     id: int
     session_id: str
@@ -83,41 +249,261 @@ class StoryRoll:
 
 
 class SQLiteStore:
-    """Thread-safe helper around sqlite3 for DMK."""
+    """Thread-safe helper around sqlite3 for DMK.
+
+    Writes go through a single read-write connection serialized by ``_lock``;
+    reads borrow from a small pool of read-only connections so they proceed
+    in parallel with writers under WAL.
 
-    def __init__(self, db_path: Optional[Path] = None) -> None:
+    Sessions and story state are cached in-process and only invalidated by
+    writes made through this store, so one database file should have a
+    single writing process; rows changed by another process (or by raw SQL
+    on ``connect()``) can be served stale until evicted.
+    """
+
+    def __init__(self, db_path: Optional[Union[Path, str]] = None) -> None:
         settings = get_settings()
         if db_path is None:
             db_path = settings.db_path_obj
-        self.path = ensure_database_path(db_path)
+        # ":memory:" keeps the whole database in the writer connection.
+        self._in_memory = str(db_path) == MEMORY_DB_PATH
+        self.path = Path(MEMORY_DB_PATH) if self._in_memory else ensure_database_path(Path(db_path))
         self._connection: Optional[sqlite3.Connection] = None
         self._lock = threading.RLock()
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_connections: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._seen_users: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._seen_users_lock = threading.Lock()
+        self._write_queue: queue.Queue[Optional[tuple[str, tuple[Any, ...], Future[int]]]] = (
+            queue.Queue()
+        )
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # The writer thread only holds a weak reference to the store; this wakes
+        # it so it exits when an unclosed store is garbage-collected.
+        weakref.finalize(self, self._write_queue.put, None)
+        self._session_cache: OrderedDict[str, SessionState] = OrderedDict()
+        self._story_state_cache: OrderedDict[str, StoryState] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Bumped on every cached write so a read that raced a commit never
+        # repopulates the cache with the row it saw before that commit.
+        self._cache_epoch = 0
+
+    @classmethod
+    def in_memory(cls) -> "SQLiteStore":
+        """Return a store with a private, non-durable in-memory database."""
+        return cls(db_path=MEMORY_DB_PATH)
 
     def connect(self) -> sqlite3.Connection:
-        """Return (and lazily initialize) the sqlite3 connection."""
+        """Return (and lazily initialize) the read-write sqlite3 connection."""
         if self._connection is None:
-            self._connection = sqlite3.connect(
+            with self._lock:
+                if self._connection is None:
+                    self._connection = self._open_connection()
+        return self._connection
+
+    def _open_connection(self, *, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            conn = sqlite3.connect(
+                f"{self.path.as_uri()}?mode=ro",
+                uri=True,
+                timeout=5.0,
+                check_same_thread=False,
+            )
+            # Readers keep plain tuples; the row builders unpack positionally.
+        else:
+            # Autocommit mode: the driver never opens implicit transactions, so
+            # every write transaction is an explicit BEGIN IMMEDIATE in _write_tx.
+            conn = sqlite3.connect(
                 self.path,
+                timeout=5.0,
                 check_same_thread=False,
+                isolation_level=None,
             )
-            self._connection.row_factory = sqlite3.Row
-        return self._connection
+            conn.execute("PRAGMA foreign_keys = ON")
+            if not self._in_memory:
+                journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+                logger.debug("sqlite journal_mode=%s for %s", journal_mode, self.path)
+            # WAL only needs fsync at checkpoints, so NORMAL stays crash-safe.
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -65536")  # 64 MiB
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
+        return conn
 
-    def migrate(self) -> None:
-        """Apply schema migrations from docs/DB_SCHEMA.sql."""
-        sql = SCHEMA_PATH.read_text(encoding="utf-8")
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection, opening up to READ_POOL_SIZE on demand."""
+        if self._in_memory:
+            # Each connection to ":memory:" is a separate database, so reads
+            # go through the writer connection instead of the pool.
+            with self._lock:
+                yield self.connect()
+            return
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if len(self._reader_connections) < READ_POOL_SIZE:
+                conn = self._open_connection(read_only=True)
+                self._reader_connections.append(conn)
+                return conn
+        # Pool is full: wait for another thread to return a connection.
+        return self._readers.get()
+
+    @contextmanager
+    def _write_tx(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write lock around a BEGIN IMMEDIATE transaction on the writer connection.
+
+        Taking the RESERVED lock up front avoids the deferred lock upgrade (and
+        its SQLITE_BUSY) when another process is writing; the connection's
+        5s timeout doubles as busy_timeout.
+        """
         conn = self.connect()
         with self._lock:
-            conn.executescript(sql)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                # A failed COMMIT may already have ended the transaction, and a
+                # failing ROLLBACK must not replace the error being raised.
+                if conn.in_transaction:
+                    try:
+                        conn.execute("ROLLBACK")
+                    except sqlite3.Error:
+                        logger.exception("Rollback failed after a write error")
+                raise
+
+    def migrate(self) -> None:
+        """Apply schema migrations from docs/DB_SCHEMA.sql.
+
+        Runs on a short-lived connection so startup DDL never holds the
+        writer lock, then compacts the WAL before normal traffic starts.
+        The whole script commits as one transaction, so a fresh database pays
+        for one journal sync instead of one per statement.
+        """
+        script = f"BEGIN;\n{SCHEMA_PATH.read_text(encoding='utf-8')}\nCOMMIT;"
+        if self._in_memory:
+            # A second connection would see a different in-memory database.
+            conn = self.connect()
+            with self._lock:
+                conn.executescript(script)
+                self._ensure_session_columns(conn)
+            return
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            # journal_mode can't change inside a transaction; the schema's own
+            # PRAGMA is then a no-op.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(script)
             self._ensure_session_columns(conn)
-            conn.commit()
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
 
     def close(self) -> None:
-        """Close the connection if open."""
-        if self._connection is not None:
-            with self._lock:
+        """Stop the writer thread and close the writer and reader connections."""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._write_queue.put(None)
+                self._writer.join()
+                self._writer = None
+        with self._readers_lock:
+            for conn in self._reader_connections:
+                conn.close()
+            self._reader_connections.clear()
+            self._readers = queue.LifoQueue()
+        with self._lock:
+            if self._connection is not None:
                 self._connection.close()
                 self._connection = None
+        with self._cache_lock:
+            self._session_cache.clear()
+            self._story_state_cache.clear()
+        # A reopened store may point at a fresh database (always, for ":memory:").
+        with self._seen_users_lock:
+            self._seen_users.clear()
+
+    def _enqueue_write(self, sql: str, params: tuple[Any, ...]) -> int:
+        """Run a single-statement write on the writer thread and return its lastrowid."""
+        future: Future[int] = Future()
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=_writer_loop,
+                    args=(weakref.ref(self), self._write_queue),
+                    name="dmk-sqlite-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+            self._write_queue.put((sql, params, future))
+        return future.result()
+
+    def _commit_batch(self, batch: list[tuple[str, tuple[Any, ...], Future[int]]]) -> None:
+        """Apply queued writes in one transaction; a failing statement only fails its caller."""
+        results: list[tuple[Future[int], int]] = []
+        try:
+            with self._write_tx() as conn:
+                for sql, params, future in batch:
+                    conn.execute("SAVEPOINT queued_write")
+                    try:
+                        cursor = conn.execute(sql, params)
+                    except Exception as exc:  # noqa: BLE001 - handed to the caller
+                        conn.execute("ROLLBACK TO queued_write")
+                        conn.execute("RELEASE queued_write")
+                        future.set_exception(exc)
+                        continue
+                    conn.execute("RELEASE queued_write")
+                    # Statements that insert nothing (an upsert's update) have no lastrowid.
+                    results.append((future, cursor.lastrowid or 0))
+        except Exception as exc:  # noqa: BLE001 - handed to the callers
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, rowid in results:
+            future.set_result(rowid)
+
+    def _cache_get(self, cache: OrderedDict[str, Any], key: str) -> Any:
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_fill(self, cache: OrderedDict[str, Any], key: str, value: Any, epoch: int) -> None:
+        """Cache a value read from disk unless a write landed since ``epoch``."""
+        with self._cache_lock:
+            if epoch != self._cache_epoch:
+                return
+            cache[key] = value
+            if len(cache) > STATE_CACHE_LIMIT:
+                cache.popitem(last=False)
+
+    def _cache_write(self, cache: OrderedDict[str, Any], key: str, value: Any) -> None:
+        """Record a committed write; call while still holding ``_lock``."""
+        with self._cache_lock:
+            self._cache_epoch += 1
+            if value is None:
+                cache.pop(key, None)
+                return
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > STATE_CACHE_LIMIT:
+                cache.popitem(last=False)
 
     def _ensure_session_columns(self, conn: sqlite3.Connection) -> None:
         """Add newly introduced columns to sessions when missing."""
@@ -146,25 +532,40 @@ class SQLiteStore:
                 raise
 
     def ensure_user(self, user_id: str, display_name: Optional[str] = None) -> None:
-        """Insert or update a user record."""
-        conn = self.connect()
-        with self._lock:
-            conn.execute(
-                """
-                INSERT INTO users (id, display_name)
-                VALUES (?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    display_name=excluded.display_name,
-                    updated_at=CURRENT_TIMESTAMP
-                """,
-                (user_id, display_name),
-            )
-            conn.commit()
+        """Insert or update a user record.
+
+        Users already written by this store are skipped when the display name
+        is unchanged or not provided.
+        """
+        with self._seen_users_lock:
+            if user_id in self._seen_users and (
+                display_name is None or self._seen_users[user_id] == display_name
+            ):
+                self._seen_users.move_to_end(user_id)
+                return
+        self._enqueue_write(
+            """
+            INSERT INTO users (id, display_name)
+            VALUES (?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                display_name=excluded.display_name,
+                updated_at=CURRENT_TIMESTAMP
+            """,
+            (user_id, display_name),
+        )
+        with self._seen_users_lock:
+            self._seen_users[user_id] = display_name
+            self._seen_users.move_to_end(user_id)
+            if len(self._seen_users) > SEEN_USERS_LIMIT:
+                self._seen_users.popitem(last=False)
 
     def get_session(self, session_id: str) -> Optional[SessionState]:
         """Fetch a session record if it exists."""
-        conn = self.connect()
-        with self._lock:
+        cached = self._cache_get(self._session_cache, session_id)
+        if cached is not None:
+            return cached
+        epoch = self._cache_epoch
+        with self._read_conn() as conn:
             row = conn.execute(
                 """
                 SELECT id,
@@ -184,18 +585,9 @@ class SQLiteStore:
             ).fetchone()
         if not row:
             return None
-        return SessionState(
-            id=row["id"],
-            user_id=row["user_id"],
-            mode=row["mode"],
-            profanity_level=row["profanity_level"],
-            rating=row["rating"],
-            tangents_level=row["tangents_level"],
-            achievement_density=row["achievement_density"],
-            story_mode_enabled=bool(row["story_mode_enabled"]),
-            created_at=_parse_datetime(row["created_at"]),
-            updated_at=_parse_datetime(row["updated_at"]),
-        )
+        session = _session_from_row(row)
+        self._cache_fill(self._session_cache, session_id, session, epoch)
+        return session
 
     def upsert_session(
         self,
@@ -208,59 +600,67 @@ class SQLiteStore:
         tangents_level: Optional[int] = None,
         achievement_density: Optional[str] = None,
         story_mode_enabled: Optional[bool] = None,
+        force: bool = False,
     ) -> SessionState:
-        """Create or update a session row, returning the latest view."""
-        current = self.get_session(session_id)
-        next_mode = mode if mode is not None else (current.mode if current else "narrator")
-        next_profanity = (
-            profanity_level
-            if profanity_level is not None
-            else (current.profanity_level if current else 3)
-        )
-        next_rating = rating if rating is not None else (current.rating if current else "PG-13")
-        next_tangents = (
-            tangents_level
-            if tangents_level is not None
-            else (current.tangents_level if current else 1)
-        )
-        next_density = (
-            achievement_density
-            if achievement_density is not None
-            else (current.achievement_density if current else "normal")
-        )
-        next_story_mode = (
-            int(story_mode_enabled)
-            if story_mode_enabled is not None
-            else (1 if (current and current.story_mode_enabled) else 0)
-        )
+        """Create or update a session row, returning the latest view.
 
-        conn = self.connect()
+        Arguments left as None keep the stored value (or the column default
+        for a new row). When nothing would change the row is left untouched,
+        including updated_at, unless ``force`` is set.
+        """
         with self._lock:
-            conn.execute(
-                """
-                INSERT INTO sessions (id, user_id, mode, profanity_level, rating, tangents_level, achievement_density, story_mode_enabled)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    mode=excluded.mode,
-                    profanity_level=excluded.profanity_level,
-                    rating=excluded.rating,
-                    tangents_level=excluded.tangents_level,
-                    achievement_density=excluded.achievement_density,
-                    story_mode_enabled=excluded.story_mode_enabled,
-                    updated_at=CURRENT_TIMESTAMP
-                """,
-                (
-                    session_id,
-                    user_id,
-                    next_mode,
-                    next_profanity,
-                    next_rating,
-                    next_tangents,
-                    next_density,
-                    next_story_mode,
-                ),
-            )
-            conn.commit()
+            with self._write_tx() as conn:
+                rows = conn.execute(
+                    """
+                    INSERT INTO sessions (id, user_id, mode, profanity_level, rating, tangents_level, achievement_density, story_mode_enabled)
+                    VALUES (
+                        :id,
+                        :user_id,
+                        COALESCE(:mode, 'narrator'),
+                        COALESCE(:profanity_level, 3),
+                        COALESCE(:rating, 'PG-13'),
+                        COALESCE(:tangents_level, 1),
+                        COALESCE(:achievement_density, 'normal'),
+                        COALESCE(:story_mode_enabled, 0)
+                    )
+                    ON CONFLICT(id) DO UPDATE SET
+                        mode=COALESCE(:mode, sessions.mode),
+                        profanity_level=COALESCE(:profanity_level, sessions.profanity_level),
+                        rating=COALESCE(:rating, sessions.rating),
+                        tangents_level=COALESCE(:tangents_level, sessions.tangents_level),
+                        achievement_density=COALESCE(:achievement_density, sessions.achievement_density),
+                        story_mode_enabled=COALESCE(:story_mode_enabled, sessions.story_mode_enabled),
+                        updated_at=CURRENT_TIMESTAMP
+                    WHERE :force
+                       OR COALESCE(:mode, sessions.mode) IS NOT sessions.mode
+                       OR COALESCE(:profanity_level, sessions.profanity_level) IS NOT sessions.profanity_level
+                       OR COALESCE(:rating, sessions.rating) IS NOT sessions.rating
+                       OR COALESCE(:tangents_level, sessions.tangents_level) IS NOT sessions.tangents_level
+                       OR COALESCE(:achievement_density, sessions.achievement_density) IS NOT sessions.achievement_density
+                       OR COALESCE(:story_mode_enabled, sessions.story_mode_enabled) IS NOT sessions.story_mode_enabled
+                    """
+                    + _RETURNING["sessions"],
+                    {
+                        "force": force,
+                        "id": session_id,
+                        "user_id": user_id,
+                        "mode": mode,
+                        "profanity_level": profanity_level,
+                        "rating": rating,
+                        "tangents_level": tangents_level,
+                        "achievement_density": achievement_density,
+                        "story_mode_enabled": (
+                            int(story_mode_enabled) if story_mode_enabled is not None else None
+                        ),
+                    },
+                ).fetchall()
+            if rows:
+                result = _session_from_row(rows[0])
+                self._cache_write(self._session_cache, session_id, result)
+                return result
+            if not _RETURNING["sessions"]:
+                self._cache_write(self._session_cache, session_id, None)
+        # With RETURNING, no row back means the update was a no-op.
         return self.get_session(session_id)  # type: ignore[return-value]
 
     def log_achievement(
@@ -272,28 +672,21 @@ class SQLiteStore:
         detail: Optional[dict[str, Any]] = None,
     ) -> AchievementGrant:
         """Insert an achievement grant row and return the created record."""
-        payload = json.dumps(detail or {}, separators=(",", ":"))
-        awarded_at = datetime.now(timezone.utc)
-        awarded_at_str = awarded_at.strftime("%Y-%m-%d %H:%M:%S")
-        conn = self.connect()
-        with self._lock:
-            cursor = conn.execute(
-                """
-                INSERT INTO achievement_grants
-                    (achievement_id, user_id, session_id, rarity, awarded_at, detail)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    achievement_id,
-                    user_id,
-                    session_id,
-                    rarity,
-                    awarded_at_str,
-                    payload,
-                ),
-            )
-            conn.commit()
-            new_id = cursor.lastrowid
+        payload = _pack_payload(detail or {})
+        # Truncate to the stored resolution so the returned grant matches a re-read.
+        awarded_at = datetime.now(timezone.utc).replace(microsecond=0)
+        awarded_at_str = awarded_at.strftime(_TIMESTAMP_FORMAT)
+        new_id = self._enqueue_write(
+            _STATEMENTS["insert_grant"],
+            (
+                achievement_id,
+                user_id,
+                session_id,
+                rarity,
+                awarded_at_str,
+                payload,
+            ),
+        )
         return AchievementGrant(
             id=new_id,
             achievement_id=achievement_id,
@@ -311,40 +704,17 @@ class SQLiteStore:
         session_id: Optional[str] = None,
     ) -> Optional[AchievementGrant]:
         """Fetch the latest grant for a user (optionally scoped to a session)."""
-        conn = self.connect()
-        query = """
-            SELECT id,
-                   achievement_id,
-                   user_id,
-                   session_id,
-                   rarity,
-                   awarded_at,
-                   detail
-            FROM achievement_grants
-            WHERE achievement_id = ?
-              AND user_id = ?
-        """
-        params: list[Any] = [achievement_id, user_id]
-        if session_id:
-            query += " AND session_id = ?"
-            params.append(session_id)
-        query += " ORDER BY awarded_at DESC LIMIT 1"
-
-        with self._lock:
-            row = conn.execute(query, params).fetchone()
-
-        if not row:
-            return None
-
-        return AchievementGrant(
-            id=row["id"],
-            achievement_id=row["achievement_id"],
-            user_id=row["user_id"],
-            session_id=row["session_id"],
-            rarity=row["rarity"],
-            awarded_at=_parse_datetime(row["awarded_at"]),
-            detail=json.loads(row["detail"] or "{}"),
-        )
+        with self._read_conn() as conn:
+            if session_id:
+                row = conn.execute(
+                    _STATEMENTS["latest_grant_in_session"],
+                    (achievement_id, user_id, session_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    _STATEMENTS["latest_grant"], (achievement_id, user_id)
+                ).fetchone()
+        return _grant_from_row(row) if row else None
 
     def fetch_latest_grant_any_session(
         self, achievement_id: str, user_id: str
@@ -354,41 +724,12 @@ class SQLiteStore:
 
     def fetch_most_recent_for_user(self, user_id: str) -> Optional[AchievementGrant]:
         """Return the most recent achievement grant for a user."""
-        conn = self.connect()
-        with self._lock:
-            row = conn.execute(
-                """
-                SELECT id,
-                       achievement_id,
-                       user_id,
-                       session_id,
-                       rarity,
-                       awarded_at,
-                       detail
-                FROM achievement_grants
-                WHERE user_id = ?
-                ORDER BY awarded_at DESC
-                LIMIT 1
-                """,
-                (user_id,),
-            ).fetchone()
-
-        if not row:
-            return None
-
-        return AchievementGrant(
-            id=row["id"],
-            achievement_id=row["achievement_id"],
-            user_id=row["user_id"],
-            session_id=row["session_id"],
-            rarity=row["rarity"],
-            awarded_at=_parse_datetime(row["awarded_at"]),
-            detail=json.loads(row["detail"] or "{}"),
-        )
+        with self._read_conn() as conn:
+            row = conn.execute(_STATEMENTS["most_recent_grant"], (user_id,)).fetchone()
+        return _grant_from_row(row) if row else None
 
     def get_story_profile(self, session_id: str) -> Optional[StoryProfile]:
-        conn = self.connect()
-        with self._lock:
+        with self._read_conn() as conn:
             row = conn.execute(
                 """
                 SELECT session_id,
@@ -412,22 +753,7 @@ class SQLiteStore:
             ).fetchone()
         if not row:
             return None
-        return StoryProfile(
-            session_id=row["session_id"],
-            user_id=row["user_id"],
-            character_name=row["character_name"],
-            pronouns=row["pronouns"],
-            race=row["race"],
-            character_class=row["character_class"],
-            backstory=row["backstory"],
-            level=row["level"],
-            experience=row["experience"],
-            ability_scores=json.loads(row["ability_scores"] or "{}"),
-            inventory=json.loads(row["inventory"] or "{}"),
-            metadata=json.loads(row["metadata"] or "{}"),
-            created_at=_parse_datetime(row["created_at"]),
-            updated_at=_parse_datetime(row["updated_at"]),
-        )
+        return _profile_from_row(row)
 
     def upsert_story_profile(
         self,
@@ -444,20 +770,10 @@ class SQLiteStore:
         ability_scores: Optional[dict[str, Any]] = None,
         inventory: Optional[dict[str, Any]] = None,
         metadata: Optional[dict[str, Any]] = None,
+        force: bool = False,
     ) -> StoryProfile:
-        current = self.get_story_profile(session_id)
-        next_level = level if level is not None else (current.level if current else 1)
-        next_experience = (
-            experience if experience is not None else (current.experience if current else 0)
-        )
-        next_ability = ability_scores if ability_scores is not None else (
-            current.ability_scores if current else {}
-        )
-        next_inventory = inventory if inventory is not None else (current.inventory if current else {})
-        next_metadata = metadata if metadata is not None else (current.metadata if current else {})
-        conn = self.connect()
-        with self._lock:
-            conn.execute(
+        with self._write_tx() as conn:
+            rows = conn.execute(
                 """
                 INSERT INTO story_profiles (
                     session_id,
@@ -473,50 +789,77 @@ class SQLiteStore:
                     inventory,
                     metadata
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (
+                    :session_id,
+                    :user_id,
+                    :character_name,
+                    :pronouns,
+                    :race,
+                    :character_class,
+                    :backstory,
+                    COALESCE(:level, 1),
+                    COALESCE(:experience, 0),
+                    COALESCE(:ability_scores, '{}'),
+                    COALESCE(:inventory, '{}'),
+                    COALESCE(:metadata, '{}')
+                )
                 ON CONFLICT(session_id) DO UPDATE SET
-                    character_name=excluded.character_name,
-                    pronouns=excluded.pronouns,
-                    race=excluded.race,
-                    character_class=excluded.character_class,
-                    backstory=excluded.backstory,
-                    level=excluded.level,
-                    experience=excluded.experience,
-                    ability_scores=excluded.ability_scores,
-                    inventory=excluded.inventory,
-                    metadata=excluded.metadata,
+                    character_name=COALESCE(:character_name, story_profiles.character_name),
+                    pronouns=COALESCE(:pronouns, story_profiles.pronouns),
+                    race=COALESCE(:race, story_profiles.race),
+                    character_class=COALESCE(:character_class, story_profiles.character_class),
+                    backstory=COALESCE(:backstory, story_profiles.backstory),
+                    level=COALESCE(:level, story_profiles.level),
+                    experience=COALESCE(:experience, story_profiles.experience),
+                    ability_scores=COALESCE(:ability_scores, story_profiles.ability_scores),
+                    inventory=COALESCE(:inventory, story_profiles.inventory),
+                    metadata=COALESCE(:metadata, story_profiles.metadata),
                     updated_at=CURRENT_TIMESTAMP
-                """,
-                (
-                    session_id,
-                    user_id,
-                    character_name
-                    if character_name is not None
-                    else (current.character_name if current else None),
-                    pronouns if pronouns is not None else (current.pronouns if current else None),
-                    race if race is not None else (current.race if current else None),
-                    character_class
-                    if character_class is not None
-                    else (current.character_class if current else None),
-                    backstory if backstory is not None else (current.backstory if current else None),
-                    next_level,
-                    next_experience,
-                    json.dumps(next_ability, separators=(",", ":")),
-                    json.dumps(next_inventory, separators=(",", ":")),
-                    json.dumps(next_metadata, separators=(",", ":")),
-                ),
-            )
-            conn.commit()
+                WHERE :force
+                   OR COALESCE(:character_name, story_profiles.character_name) IS NOT story_profiles.character_name
+                   OR COALESCE(:pronouns, story_profiles.pronouns) IS NOT story_profiles.pronouns
+                   OR COALESCE(:race, story_profiles.race) IS NOT story_profiles.race
+                   OR COALESCE(:character_class, story_profiles.character_class) IS NOT story_profiles.character_class
+                   OR COALESCE(:backstory, story_profiles.backstory) IS NOT story_profiles.backstory
+                   OR COALESCE(:level, story_profiles.level) IS NOT story_profiles.level
+                   OR COALESCE(:experience, story_profiles.experience) IS NOT story_profiles.experience
+                   OR COALESCE(:ability_scores, story_profiles.ability_scores) IS NOT story_profiles.ability_scores
+                   OR COALESCE(:inventory, story_profiles.inventory) IS NOT story_profiles.inventory
+                   OR COALESCE(:metadata, story_profiles.metadata) IS NOT story_profiles.metadata
+                """
+                + _RETURNING["story_profiles"],
+                {
+                    "force": force,
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "character_name": character_name,
+                    "pronouns": pronouns,
+                    "race": race,
+                    "character_class": character_class,
+                    "backstory": backstory,
+                    "level": level,
+                    "experience": experience,
+                    "ability_scores": _json_column(ability_scores),
+                    "inventory": _json_column(inventory),
+                    "metadata": _json_column(metadata),
+                },
+            ).fetchall()
+        if rows:
+            return _profile_from_row(rows[0])
         return self.get_story_profile(session_id)  # type: ignore[return-value]
 
     def get_story_state(self, session_id: str) -> Optional[StoryState]:
-        conn = self.connect()
-        with self._lock:
+        """Fetch story state, served from cache when possible; do not mutate flags/stats."""
+        cached = self._cache_get(self._story_state_cache, session_id)
+        if cached is not None:
+            return cached
+        epoch = self._cache_epoch
+        with self._read_conn() as conn:
             row = conn.execute(
                 """
                 SELECT session_id,
                        current_scene,
-                       scene_history,
+                       CAST(scene_history AS TEXT),
                        flags,
                        stats,
                        created_at,
@@ -528,15 +871,9 @@ class SQLiteStore:
             ).fetchone()
         if not row:
             return None
-        return StoryState(
-            session_id=row["session_id"],
-            current_scene=row["current_scene"],
-            scene_history=tuple(json.loads(row["scene_history"] or "[]")),
-            flags=json.loads(row["flags"] or "{}"),
-            stats=json.loads(row["stats"] or "{}"),
-            created_at=_parse_datetime(row["created_at"]),
-            updated_at=_parse_datetime(row["updated_at"]),
-        )
+        state = _state_from_row(row)
+        self._cache_fill(self._story_state_cache, session_id, state, epoch)
+        return state
 
     def upsert_story_state(
         self,
@@ -546,45 +883,59 @@ class SQLiteStore:
         scene_history: Optional[Sequence[str]] = None,
         flags: Optional[dict[str, Any]] = None,
         stats: Optional[dict[str, Any]] = None,
+        force: bool = False,
     ) -> StoryState:
-        current = self.get_story_state(session_id)
-        next_scene = current_scene if current_scene is not None else (current.current_scene if current else None)
-        next_history = (
-            list(scene_history)
-            if scene_history is not None
-            else (list(current.scene_history) if current else [])
-        )
-        next_flags = flags if flags is not None else (current.flags if current else {})
-        next_stats = stats if stats is not None else (current.stats if current else {})
-
-        conn = self.connect()
         with self._lock:
-            conn.execute(
-                """
-                INSERT INTO story_state (
-                    session_id,
-                    current_scene,
-                    scene_history,
-                    flags,
-                    stats
-                )
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(session_id) DO UPDATE SET
-                    current_scene=excluded.current_scene,
-                    scene_history=excluded.scene_history,
-                    flags=excluded.flags,
-                    stats=excluded.stats,
-                    updated_at=CURRENT_TIMESTAMP
-                """,
-                (
-                    session_id,
-                    next_scene,
-                    json.dumps(list(next_history), separators=(",", ":")),
-                    json.dumps(next_flags, separators=(",", ":")),
-                    json.dumps(next_stats, separators=(",", ":")),
-                ),
-            )
-            conn.commit()
+            with self._write_tx() as conn:
+                rows = conn.execute(
+                    """
+                    INSERT INTO story_state (
+                        session_id,
+                        current_scene,
+                        scene_history,
+                        flags,
+                        stats
+                    )
+                    VALUES (
+                        :session_id,
+                        :current_scene,
+                        COALESCE(:scene_history, ''),
+                        COALESCE(:flags, '{}'),
+                        COALESCE(:stats, '{}')
+                    )
+                    ON CONFLICT(session_id) DO UPDATE SET
+                        current_scene=COALESCE(:current_scene, story_state.current_scene),
+                        scene_history=COALESCE(:scene_history, story_state.scene_history),
+                        flags=COALESCE(:flags, story_state.flags),
+                        stats=COALESCE(:stats, story_state.stats),
+                        updated_at=CURRENT_TIMESTAMP
+                    WHERE :force
+                       OR COALESCE(:current_scene, story_state.current_scene) IS NOT story_state.current_scene
+                       OR COALESCE(:scene_history, story_state.scene_history) IS NOT story_state.scene_history
+                       OR COALESCE(:flags, story_state.flags) IS NOT story_state.flags
+                       OR COALESCE(:stats, story_state.stats) IS NOT story_state.stats
+                    """
+                    + _RETURNING["story_state"],
+                    {
+                        "force": force,
+                        "session_id": session_id,
+                        "current_scene": current_scene,
+                        "scene_history": (
+                            SCENE_HISTORY_SEP.join(scene_history)
+                            if scene_history is not None
+                            else None
+                        ),
+                        "flags": _json_column(flags),
+                        "stats": _json_column(stats),
+                    },
+                ).fetchall()
+            if rows:
+                result = _state_from_row(rows[0])
+                self._cache_write(self._story_state_cache, session_id, result)
+                return result
+            if not _RETURNING["story_state"]:
+                self._cache_write(self._story_state_cache, session_id, None)
+        # With RETURNING, no row back means the update was a no-op.
         return self.get_story_state(session_id)  # type: ignore[return-value]
 
     def log_story_roll(
@@ -595,32 +946,28 @@ class SQLiteStore:
         result_total: int,
         result_detail: dict[str, Any],
     ) -> StoryRoll:
-        conn = self.connect()
-        created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-        with self._lock:
-            cursor = conn.execute(
-                """
-                INSERT INTO story_rolls (
-                    session_id,
-                    user_id,
-                    expression,
-                    result_total,
-                    result_detail,
-                    created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    user_id,
-                    expression,
-                    result_total,
-                    json.dumps(result_detail, separators=(",", ":")),
-                    created_at,
-                ),
+        created_at = datetime.now(timezone.utc).replace(microsecond=0)
+        roll_id = self._enqueue_write(
+            """
+            INSERT INTO story_rolls (
+                session_id,
+                user_id,
+                expression,
+                result_total,
+                result_detail,
+                created_at
             )
-            conn.commit()
-            roll_id = cursor.lastrowid
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                session_id,
+                user_id,
+                expression,
+                result_total,
+                _pack_payload(result_detail),
+                created_at.strftime(_TIMESTAMP_FORMAT),
+            ),
+        )
         return StoryRoll(
             id=roll_id,
             session_id=session_id,
@@ -628,7 +975,7 @@ class SQLiteStore:
             expression=expression,
             result_total=result_total,
             result_detail=result_detail,
-            created_at=datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc),
+            created_at=created_at,
         )
 
     def fetch_recent_story_rolls(
@@ -636,8 +983,7 @@ class SQLiteStore:
         session_id: str,
         limit: int = 10,
     ) -> list[StoryRoll]:
-        conn = self.connect()
-        with self._lock:
+        with self._read_conn() as conn:
             rows = conn.execute(
                 """
                 SELECT id,
@@ -654,20 +1000,159 @@ class SQLiteStore:
                 """,
                 (session_id, limit),
             ).fetchall()
-        rolls: list[StoryRoll] = []
-        for row in rows:
-            rolls.append(
-                StoryRoll(
-                    id=row["id"],
-                    session_id=row["session_id"],
-                    user_id=row["user_id"],
-                    expression=row["expression"],
-                    result_total=row["result_total"],
-                    result_detail=json.loads(row["result_detail"] or "{}"),
-                    created_at=_parse_datetime(row["created_at"]),
-                )
-            )
-        return rolls
+        return [_roll_from_row(row) for row in rows]
+
+
+# Row builders unpack positionally; column order must match the SELECTs.
+
+
+def _writer_loop(
+    store_ref: weakref.ReferenceType[SQLiteStore],
+    write_queue: queue.Queue[Optional[tuple[str, tuple[Any, ...], Future[int]]]],
+) -> None:
+    """Drain queued writes in batches until close() or garbage collection sends None."""
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        batch = [item]
+        stop = False
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                if COMMIT_DELAY_SEC:
+                    item = write_queue.get(timeout=COMMIT_DELAY_SEC)
+                else:
+                    item = write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        store = store_ref()
+        if store is None:
+            return
+        store._commit_batch(batch)
+        # Drop the strong reference before blocking on the queue again.
+        del store
+        if stop:
+            return
+
+
+def _grant_from_row(row: Sequence[Any]) -> AchievementGrant:
+    id_, achievement_id, user_id, session_id, rarity, awarded_at, detail = row
+    return AchievementGrant(
+        id=id_,
+        achievement_id=achievement_id,
+        user_id=user_id,
+        session_id=session_id,
+        rarity=rarity,
+        awarded_at=_parse_datetime(awarded_at),
+        detail=_unpack_payload(detail) if detail else {},
+    )
+
+
+def _session_from_row(row: Sequence[Any]) -> SessionState:
+    (
+        id_,
+        user_id,
+        mode,
+        profanity_level,
+        rating,
+        tangents_level,
+        achievement_density,
+        story_mode_enabled,
+        created_at,
+        updated_at,
+    ) = row
+    return SessionState(
+        id=id_,
+        user_id=user_id,
+        mode=mode,
+        profanity_level=profanity_level,
+        rating=rating,
+        tangents_level=tangents_level,
+        achievement_density=achievement_density,
+        story_mode_enabled=bool(story_mode_enabled),
+        created_at=_parse_datetime(created_at),
+        updated_at=_parse_datetime(updated_at),
+    )
+
+
+def _profile_from_row(row: Sequence[Any]) -> StoryProfile:
+    (
+        session_id,
+        user_id,
+        character_name,
+        pronouns,
+        race,
+        character_class,
+        backstory,
+        level,
+        experience,
+        ability_scores,
+        inventory,
+        metadata,
+        created_at,
+        updated_at,
+    ) = row
+    return StoryProfile(
+        session_id=session_id,
+        user_id=user_id,
+        character_name=character_name,
+        pronouns=pronouns,
+        race=race,
+        character_class=character_class,
+        backstory=backstory,
+        level=level,
+        experience=experience,
+        ability_scores=_loads(ability_scores) if ability_scores else {},
+        inventory=_loads(inventory) if inventory else {},
+        metadata=_loads(metadata) if metadata else {},
+        created_at=_parse_datetime(created_at),
+        updated_at=_parse_datetime(updated_at),
+    )
+
+
+def _state_from_row(row: Sequence[Any]) -> StoryState:
+    session_id, current_scene, scene_history, flags, stats, created_at, updated_at = row
+    return StoryState(
+        session_id=session_id,
+        current_scene=current_scene,
+        scene_history=_split_scene_history(scene_history),
+        flags=_loads(flags) if flags else {},
+        stats=_loads(stats) if stats else {},
+        created_at=_parse_datetime(created_at),
+        updated_at=_parse_datetime(updated_at),
+    )
+
+
+def _roll_from_row(row: Sequence[Any]) -> StoryRoll:
+    id_, session_id, user_id, expression, result_total, result_detail, created_at = row
+    return StoryRoll(
+        id=id_,
+        session_id=session_id,
+        user_id=user_id,
+        expression=expression,
+        result_total=result_total,
+        result_detail=_unpack_payload(result_detail) if result_detail else {},
+        created_at=_parse_datetime(created_at),
+    )
+
+
+def _split_scene_history(value: Optional[str]) -> tuple[str, ...]:
+    if not value:
+        return ()
+    if value[0] == "[":  # rows written before the delimited format
+        return tuple(_loads(value))
+    return tuple(value.split(SCENE_HISTORY_SEP))
+
+
+def _json_column(value: Any) -> Optional[str]:
+    """Encode a JSON column for an upsert; None keeps the stored value."""
+    if value is None:
+        return None
+    return _dumps(value).decode("utf-8")
 
 
 def _parse_datetime(value: Any) -> datetime:
@@ -676,19 +1161,24 @@ def _parse_datetime(value: Any) -> datetime:
             return value.replace(tzinfo=timezone.utc)
         return value.astimezone(timezone.utc)
     if isinstance(value, str):
-        try:
-            dt = datetime.fromisoformat(value)
-        except ValueError:
-            dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
-        return dt
+        return _parse_dt_str(value)
     raise TypeError(f"Unsupported datetime value: {value!r}")
 
 
+@lru_cache(maxsize=4096)
+def _parse_dt_str(value: str) -> datetime:
+    # Timestamps have second resolution, so bursts of rows share strings.
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        dt = datetime.strptime(value, _TIMESTAMP_FORMAT)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
 __all__ = [
+    "ABILITY_KEYS",
     "SQLiteStore",
     "AchievementGrant",
     "SessionState",
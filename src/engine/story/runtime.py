@@ -4,14 +4,25 @@ from __future__ import annotations
 
 import json
 import random
+import re
+import sys
+from collections import deque
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Optional, Sequence
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
 from ..storage import SQLiteStore, StoryProfile, StoryState
-from ..character import ABILITY_KEYS, ability_modifier, level_from_xp
+from ..character import ABILITY_LINE_TEMPLATE, ability_modifier, level_from_xp
+from ...utils.dice import roll_die
 
-AUTO_CHECK_TAGS = {
+AUTO_CHECK_TAGS: Mapping[str, tuple[str, int]] = MappingProxyType({
     "chaos": ("cha", 12),
     "risk": ("dex", 12),
     "puzzle": ("int", 13),
@@ -23,10 +34,30 @@ AUTO_CHECK_TAGS = {
     "magic": ("int", 14),
     "inventory": ("wis", 10),
     "shortcut": ("dex", 12),
-}
+})
+
+SCENE_HISTORY_LIMIT = 50
+
+# Turn triggers are tracked as bit flags and emitted in this canonical order.
+_TRIGGER_ORDER = ("event.story.choice", "event.story.level_up", "event.story.turn", "event.message")
+_TRIGGER_BITS: Mapping[str, int] = MappingProxyType(
+    {trigger: 1 << position for position, trigger in enumerate(_TRIGGER_ORDER)}
+)
+_TRIGGERS_BY_MASK: tuple[tuple[str, ...], ...] = tuple(
+    tuple(trigger for trigger in _TRIGGER_ORDER if mask & _TRIGGER_BITS[trigger])
+    for mask in range(1 << len(_TRIGGER_ORDER))
+)
+
+# Both accept raw bytes, so the campaign file is never decoded to str first.
+_json_loads = orjson.loads if orjson is not None else json.loads
 
+# Only the "/choose <arg>" form is unwrapped; free text must stay whole for
+# the label substring match.
+_CHOOSE_COMMAND_RE = re.compile(r"^/choose\s+(\S+)")
+_ABILITIES_TEMPLATE = "Abilities: " + ABILITY_LINE_TEMPLATE
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class StoryChoice:
     id: str
     label: str
@@ -37,7 +68,7 @@ class StoryChoice:
     check: Optional["StoryCheck"] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryCheck:
     ability: str
     difficulty_class: int
@@ -48,7 +79,7 @@ class StoryCheck:
     note: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryCheckOutcome:
     ability: str
     rolls: Sequence[int]
@@ -60,7 +91,7 @@ class StoryCheckOutcome:
     manual: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryScene:
     id: str
     title: str
@@ -69,7 +100,7 @@ class StoryScene:
     tags: Sequence[str] = field(default_factory=tuple)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryTurnResult:
     scene: StoryScene
     selected_choice: Optional[StoryChoice]
@@ -81,6 +112,108 @@ class StoryTurnResult:
     auto_generated_check: bool = False
 
 
+@dataclass(frozen=True, slots=True)
+class _Campaign:
+    root_scene: Optional[str]
+    scenes: Mapping[str, StoryScene]
+    # scene id -> lowercased choice id -> choice
+    choice_lookup: Mapping[str, Mapping[str, StoryChoice]]
+    # scene id -> (scene line, choices block) for the agent message
+    agent_sections: Mapping[str, tuple[str, str]]
+    # scene id -> formatted scene attachment
+    attachments: Mapping[str, str]
+    # scene id -> lowercased choice labels, parallel to scene.choices
+    label_lowers: Mapping[str, tuple[str, ...]]
+
+
+@lru_cache(maxsize=8)
+def _build_campaign(path: str, mtime_ns: int) -> _Campaign:
+    """Parse and index a campaign file once; ``mtime_ns`` in the key picks up edits.
+
+    Scenes are frozen, so every engine on the same file shares one graph.
+    """
+    raw = _json_loads(Path(path).read_bytes())
+    scenes = _index_scenes(raw["scenes"])
+    choice_lookup: dict[str, Mapping[str, StoryChoice]] = {}
+    agent_sections: dict[str, tuple[str, str]] = {}
+    attachments: dict[str, str] = {}
+    label_lowers: dict[str, tuple[str, ...]] = {}
+    for scene_id, scene in scenes.items():
+        by_id: dict[str, StoryChoice] = {}
+        for choice in scene.choices:
+            by_id.setdefault(choice.id.lower(), choice)
+        choice_lookup[scene_id] = MappingProxyType(by_id)
+        agent_sections[scene_id] = (
+            f"Current scene: {scene.id} — {scene.title}",
+            "\n".join(
+                ["Choices:"]
+                + [
+                    f"  {idx}. {option.label} (id={option.id})"
+                    for idx, option in enumerate(scene.choices, start=1)
+                ]
+            ),
+        )
+        attachments[scene_id] = _format_scene_attachment(scene)
+        label_lowers[scene_id] = tuple(choice.label.lower() for choice in scene.choices)
+    return _Campaign(
+        root_scene=raw.get("root_scene"),
+        scenes=MappingProxyType(scenes),
+        choice_lookup=MappingProxyType(choice_lookup),
+        agent_sections=MappingProxyType(agent_sections),
+        attachments=MappingProxyType(attachments),
+        label_lowers=MappingProxyType(label_lowers),
+    )
+
+
+def _format_scene_attachment(scene: StoryScene) -> str:
+    narration = " ".join(scene.narration)
+    choice_lines = [f"{idx}. {choice.label}" for idx, choice in enumerate(scene.choices, start=1)]
+    if choice_lines:
+        choice_text = "Choices: " + " | ".join(choice_lines)
+    else:
+        choice_text = "No explicit choices; free-form response allowed."
+    return f"Scene[{scene.id}]: {scene.title}\n{narration}\n{choice_text}"
+
+
+def _index_scenes(raw_scenes: Sequence[dict]) -> dict[str, StoryScene]:
+    indexed: dict[str, StoryScene] = {}
+    for entry in raw_scenes:
+        choices = []
+        for choice_data in entry.get("choices", []):
+            check = None
+            if "check" in choice_data:
+                raw_check = choice_data["check"]
+                check = StoryCheck(
+                    ability=sys.intern(raw_check["ability"]),
+                    difficulty_class=int(raw_check.get("dc", 10)),
+                    success_scene=raw_check.get("success_scene"),
+                    failure_scene=raw_check.get("failure_scene"),
+                    success_xp=int(raw_check.get("success_xp", 0)),
+                    failure_xp=int(raw_check.get("failure_xp", 0)),
+                    note=raw_check.get("note"),
+                )
+            choices.append(
+                StoryChoice(
+                    id=sys.intern(choice_data["id"]),
+                    label=choice_data["label"],
+                    next_scene=sys.intern(choice_data["next_scene"]),
+                    achievement_id=choice_data.get("achievement_id"),
+                    xp_reward=int(choice_data.get("xp_reward", 0)),
+                    tags=tuple(sys.intern(tag) for tag in choice_data.get("tags", [])),
+                    check=check,
+                )
+            )
+        scene = StoryScene(
+            id=sys.intern(entry["id"]),
+            title=entry.get("title", entry["id"].title()),
+            narration=tuple(entry.get("narration", [])),
+            choices=tuple(choices),
+            tags=tuple(sys.intern(tag) for tag in entry.get("tags", [])),
+        )
+        indexed[scene.id] = scene
+    return indexed
+
+
 class StoryEngine:
     """Simple scene graph story engine."""
 
@@ -88,50 +221,20 @@ class StoryEngine:
         self.store = store
         root = Path(__file__).resolve().parents[3] / "assets" / "story"
         self.campaign_path = campaign_path or (root / "campaign_intro.json")
-        self._campaign = self._load_campaign(self.campaign_path)
-        self.root_scene = self._campaign.get("root_scene")
-        self.scenes = self._index_scenes(self._campaign["scenes"])
-
-    def _load_campaign(self, path: Path) -> dict:
-        return json.loads(path.read_text(encoding="utf-8"))
-
-    def _index_scenes(self, raw_scenes: Sequence[dict]) -> dict[str, StoryScene]:
-        indexed: dict[str, StoryScene] = {}
-        for entry in raw_scenes:
-            choices = []
-            for choice_data in entry.get("choices", []):
-                check = None
-                if "check" in choice_data:
-                    raw_check = choice_data["check"]
-                    check = StoryCheck(
-                        ability=raw_check["ability"],
-                        difficulty_class=int(raw_check.get("dc", 10)),
-                        success_scene=raw_check.get("success_scene"),
-                        failure_scene=raw_check.get("failure_scene"),
-                        success_xp=int(raw_check.get("success_xp", 0)),
-                        failure_xp=int(raw_check.get("failure_xp", 0)),
-                        note=raw_check.get("note"),
-                    )
-                choices.append(
-                    StoryChoice(
-                        id=choice_data["id"],
-                        label=choice_data["label"],
-                        next_scene=choice_data["next_scene"],
-                        achievement_id=choice_data.get("achievement_id"),
-                        xp_reward=int(choice_data.get("xp_reward", 0)),
-                        tags=tuple(choice_data.get("tags", [])),
-                        check=check,
-                    )
-                )
-            scene = StoryScene(
-                id=entry["id"],
-                title=entry.get("title", entry["id"].title()),
-                narration=tuple(entry.get("narration", [])),
-                choices=tuple(choices),
-                tags=tuple(entry.get("tags", [])),
-            )
-            indexed[scene.id] = scene
-        return indexed
+
+    @cached_property
+    def _campaign(self) -> _Campaign:
+        # Loaded on first use so engines that never run a story turn skip the parse.
+        resolved = self.campaign_path.resolve()
+        return _build_campaign(str(resolved), resolved.stat().st_mtime_ns)
+
+    @property
+    def root_scene(self) -> Optional[str]:
+        return self._campaign.root_scene
+
+    @property
+    def scenes(self) -> Mapping[str, StoryScene]:
+        return self._campaign.scenes
 
     def ensure_state(self, session_id: str, profile: StoryProfile) -> StoryState:
         state = self.store.get_story_state(session_id)
@@ -168,8 +271,8 @@ class StoryEngine:
         if scene is None:
             return None
 
-        choice = self._match_choice(raw_input, scene.choices)
-        triggers = ["event.story.turn", "event.message"]
+        choice = self._match_choice(raw_input, scene)
+        trigger_mask = _TRIGGER_BITS["event.story.turn"] | _TRIGGER_BITS["event.message"]
         attachments = []
         metadata: dict = {
             "scene_id": scene.id,
@@ -181,7 +284,7 @@ class StoryEngine:
         auto_generated = False
         if choice:
             auto_generated = False
-            triggers.insert(0, "event.story.choice")
+            trigger_mask |= _TRIGGER_BITS["event.story.choice"]
             metadata["choice_id"] = choice.id
             metadata["choice_label"] = choice.label
             next_scene, check_outcome, level_up, xp_awarded, auto_generated, active_check = self._apply_choice(
@@ -193,7 +296,7 @@ class StoryEngine:
             if xp_awarded:
                 metadata["xp_awarded"] = xp_awarded
             if level_up:
-                triggers.insert(1, "event.story.level_up")
+                trigger_mask |= _TRIGGER_BITS["event.story.level_up"]
                 metadata["level_up"] = level_up
             if check_outcome:
                 metadata["check"] = {
@@ -217,7 +320,7 @@ class StoryEngine:
             selected_choice=choice,
             agent_message=agent_message,
             attachments=attachments,
-            triggers=tuple(dict.fromkeys(triggers)),  # preserve order, dedupe
+            triggers=_TRIGGERS_BY_MASK[trigger_mask],
             metadata=metadata,
             check_outcome=check_outcome,
             auto_generated_check=auto_generated,
@@ -235,7 +338,9 @@ class StoryEngine:
         target_scene_id = choice.next_scene
         xp_award = choice.xp_reward
 
-        flags = dict(state.flags)
+        # Copy-on-write: _perform_check returns a new dict only when it consumes
+        # a pending roll, and stats are copied only when XP changes.
+        flags = state.flags
 
         active_check = choice.check
         auto_generated = False
@@ -261,9 +366,10 @@ class StoryEngine:
                 elif auto_generated:
                     xp_award = max(0, xp_award // 2)
 
-        history = list(state.scene_history)
+        # Bounded deque trims to the last SCENE_HISTORY_LIMIT ids as it appends.
+        history = deque(state.scene_history, maxlen=SCENE_HISTORY_LIMIT)
         history.append(target_scene_id)
-        stats = dict(state.stats)
+        stats: Optional[dict[str, Any]] = None
 
         new_xp = profile.experience
         new_level = profile.level
@@ -276,6 +382,7 @@ class StoryEngine:
                 experience=new_xp,
                 level=new_level,
             )
+            stats = dict(state.stats)
             stats["xp"] = new_xp
             stats["level"] = new_level
             if new_level > profile.level:
@@ -284,33 +391,32 @@ class StoryEngine:
         self.store.upsert_story_state(
             session_id,
             current_scene=target_scene_id,
-            scene_history=history[-50:],
+            scene_history=history,
             stats=stats,
-            flags=flags,
+            flags=flags if flags is not state.flags else None,
         )
         next_scene = self.scenes.get(target_scene_id, self.scenes[self.root_scene])
         return next_scene, check_outcome, level_up, xp_award, auto_generated, active_check
 
-    def _match_choice(
-        self, user_input: str, choices: Sequence[StoryChoice]
-    ) -> Optional[StoryChoice]:
+    def _match_choice(self, user_input: str, scene: StoryScene) -> Optional[StoryChoice]:
+        choices = scene.choices
         if not choices:
             return None
         text = user_input.strip().lower()
         if not text:
             return None
-        if text.startswith("/choose"):
-            parts = text.split()
-            if len(parts) >= 2:
-                text = parts[1]
+        command = _CHOOSE_COMMAND_RE.match(text)
+        if command:
+            text = command.group(1)
         if text.isdigit():
             index = int(text) - 1
             if 0 <= index < len(choices):
                 return choices[index]
-        for choice in choices:
-            if text == choice.id.lower():
-                return choice
-            if text in choice.label.lower():
+        by_id = self._campaign.choice_lookup[scene.id].get(text)
+        # Choices are tried in order, id then label, so an earlier label match
+        # still beats a later exact id.
+        for label, choice in zip(self._campaign.label_lowers[scene.id], choices):
+            if choice is by_id or text in label:
                 return choice
         return None
 
@@ -332,7 +438,6 @@ class StoryEngine:
         score = profile.ability_scores.get(ability, 10)
         modifier = ability_modifier(score)
 
-        flags = dict(flags)
         pending = flags.get("pending_roll")
         if pending and pending.get("ability") == ability:
             rolls = list(pending.get("rolls", [])) or [pending.get("total", 0) - modifier]
@@ -351,10 +456,10 @@ class StoryEngine:
                 success=success,
                 manual=True,
             )
-            flags.pop("pending_roll", None)
+            flags = {key: value for key, value in flags.items() if key != "pending_roll"}
             return outcome, flags
 
-        roll_value = random.randint(1, 20)
+        roll_value = roll_die(20, random)
         total = roll_value + modifier
         success = total >= check.difficulty_class
         rolls = [roll_value]
@@ -392,32 +497,20 @@ class StoryEngine:
         choice: Optional[StoryChoice],
         raw_input: str,
     ) -> str:
-        lines = [
-            f"Character: {profile.character_name or 'Unnamed'} (Level {profile.level}, XP {profile.experience})",
-            f"Race/Class: {profile.race or 'Unknown'} / {profile.character_class or 'Untrained'}",
-            "Abilities: "
-            + ", ".join(
-                f"{ability.upper()} {profile.ability_scores.get(ability, 10)}"
-                for ability in ABILITY_KEYS
-            ),
-            f"Current scene: {scene.id} — {scene.title}",
-        ]
-        if choice:
-            lines.append(f"Player selected choice: {choice.id} ({choice.label})")
-        lines.append(f"Player input: {raw_input.strip() or '[silence]'}")
-        lines.append("Choices:")
-        for idx, option in enumerate(scene.choices, start=1):
-            lines.append(f"  {idx}. {option.label} (id={option.id})")
-        return "\n".join(lines)
+        scene_line, choices_block = self._campaign.agent_sections[scene.id]
+        selected = f"\nPlayer selected choice: {choice.id} ({choice.label})" if choice else ""
+        return (
+            f"Character: {profile.character_name or 'Unnamed'} (Level {profile.level}, XP {profile.experience})\n"
+            f"Race/Class: {profile.race or 'Unknown'} / {profile.character_class or 'Untrained'}\n"
+            f"{_ABILITIES_TEMPLATE.format(*profile.ability_row)}\n"
+            f"{scene_line}{selected}\n"
+            f"Player input: {raw_input.strip() or '[silence]'}\n"
+            f"{choices_block}"
+        )
 
     def _format_scene_attachment(self, scene: StoryScene) -> str:
-        narration = " ".join(scene.narration)
-        choice_lines = [f"{idx}. {choice.label}" for idx, choice in enumerate(scene.choices, start=1)]
-        if choice_lines:
-            choice_text = "Choices: " + " | ".join(choice_lines)
-        else:
-            choice_text = "No explicit choices; free-form response allowed."
-        return f"Scene[{scene.id}]: {scene.title}\n{narration}\n{choice_text}"
+        # Scenes are frozen, so the attachment is formatted once per campaign load.
+        return self._campaign.attachments[scene.id]
 
     def _format_choice_log(self, choice: StoryChoice) -> str:
         return f"Choice taken -> {choice.id}: {choice.label}"
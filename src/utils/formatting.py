@@ -6,17 +6,24 @@ from textwrap import dedent
 
 from ..engine.achievements import Achievement
 
+_ACHIEVEMENT_TEMPLATE = dedent(
+    """\
+    🏆 ACHIEVEMENT UNLOCKED:
+    "{title}"
+    Description: {description}
+    Reward: {reward}. Rarity: {rarity}
+    """
+).strip()
+
 
 def format_achievement_block(achievement: Achievement) -> str:
     """Return the canonical achievement header block."""
-    return dedent(
-        f"""\
-        🏆 ACHIEVEMENT UNLOCKED:
-        "{achievement.title}"
-        Description: {achievement.description}
-        Reward: {achievement.reward}. Rarity: {achievement.rarity}
-        """
-    ).strip()
+    return _ACHIEVEMENT_TEMPLATE.format(
+        title=achievement.title,
+        description=achievement.description,
+        reward=achievement.reward,
+        rarity=achievement.rarity,
+    )
 
 
 __all__ = ["format_achievement_block"]
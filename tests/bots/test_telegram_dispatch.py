@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from src.bots.telegram_bot import TelegramBot
+from src.engine.modes import ModeRequest
+from src.engine.storage import SQLiteStore
+
+
+class FakeMessage:
+    def __init__(self) -> None:
+        self.replies: list[str] = []
+
+    async def reply_text(self, text: str) -> None:
+        self.replies.append(text)
+
+
+class RecordingRouter:
+    def __init__(self) -> None:
+        self.requests: list[ModeRequest] = []
+
+    def handle(self, request: ModeRequest) -> SimpleNamespace:
+        self.requests.append(request)
+        return SimpleNamespace(text="ok", was_new=False, achievement_id=None)
+
+
+def test_only_the_first_message_is_first_contact(store: SQLiteStore) -> None:
+    bot = TelegramBot.__new__(TelegramBot)
+    bot.store = store
+    bot.router = RecordingRouter()
+    bot._sound_cache = {}
+    update = SimpleNamespace(
+        effective_message=FakeMessage(),
+        effective_user=SimpleNamespace(id=7, full_name="Keith"),
+        effective_chat=SimpleNamespace(id=42),
+    )
+
+    for text in ("hello", "hello again"):
+        asyncio.run(bot._dispatch(update, text, triggers=("event.message",)))
+
+    first, second = bot.router.requests
+    assert first.triggers == ("event.message.first_contact", "event.message")
+    assert second.triggers == ("event.message",)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.engine.storage import SQLiteStore
+
+
+@pytest.fixture(scope="session")
+def migrated_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Migrate one database per test session for stores to copy."""
+    path = tmp_path_factory.mktemp("db") / "migrated.sqlite3"
+    store = SQLiteStore(db_path=path)
+    store.migrate()
+    store.close()
+    return path
+
+
+@pytest.fixture
+def store(migrated_db: Path, tmp_path: Path) -> Iterator[SQLiteStore]:
+    """Return a store backed by a private copy of the migrated database."""
+    path = tmp_path / "store.sqlite3"
+    shutil.copyfile(migrated_db, path)
+    store = SQLiteStore(db_path=path)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def memory_store() -> Iterator[SQLiteStore]:
+    """Return a migrated in-memory store, closed after the test."""
+    store = SQLiteStore.in_memory()
+    store.migrate()
+    yield store
+    store.close()
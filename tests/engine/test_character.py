@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from pathlib import Path
-
 from src.engine.character import (
     CharacterManager,
     ability_modifier,
@@ -11,17 +9,12 @@ from src.engine.character import (
 from src.engine.storage import SQLiteStore
 
 
-def make_store(tmp_path: Path) -> SQLiteStore:
-    store = SQLiteStore(db_path=tmp_path / "character.sqlite3")
-    store.migrate()
-    return store
-
-
-def test_character_manager_levels_and_scores(tmp_path) -> None:
-    store = make_store(tmp_path)
-    manager = CharacterManager(store)
+def test_character_manager_levels_and_scores(memory_store: SQLiteStore) -> None:
+    manager = CharacterManager(memory_store)
     session_id = "session-test"
     user_id = "user-test"
+    memory_store.ensure_user(user_id)
+    memory_store.upsert_session(session_id, user_id)
 
     profile = manager.ensure_profile(session_id, user_id)
     assert profile.level == 1
@@ -44,11 +37,12 @@ def test_character_manager_levels_and_scores(tmp_path) -> None:
     assert not manager.get_inventory(session_id, user_id)
 
 
-def test_finalize_profile_marks_story_ready(tmp_path) -> None:
-    store = make_store(tmp_path)
-    manager = CharacterManager(store)
+def test_finalize_profile_marks_story_ready(memory_store: SQLiteStore) -> None:
+    manager = CharacterManager(memory_store)
     session_id = "session-ready"
     user_id = "user-ready"
+    memory_store.ensure_user(user_id)
+    memory_store.upsert_session(session_id, user_id)
     manager.ensure_profile(session_id, user_id)
     manager.update_basic_field(
         session_id,
@@ -59,5 +53,5 @@ def test_finalize_profile_marks_story_ready(tmp_path) -> None:
     )
     profile = manager.finalize_profile(session_id, user_id)
     assert profile_ready(profile)
-    session_state = store.get_session(session_id)
+    session_state = memory_store.get_session(session_id)
     assert session_state is not None and session_state.story_mode_enabled
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Optional
 
 from src.config import Settings
 from src.engine.character import CharacterManager
 from src.engine.modes import ModeRequest, ModeRouter
-from src.engine.storage import SQLiteStore
+from src.engine.storage import AchievementGrant, SessionState, SQLiteStore
 
 
-@dataclass
+@dataclass(slots=True)
 class FakeAgent:
     reply: str
 
@@ -18,37 +20,88 @@ class FakeAgent:
 
 
 class FailAgent:
+    __slots__ = ()
+
     def generate_reply(self, **_: object) -> str:
         from src.agents import AgentNotConfiguredError
 
         raise AgentNotConfiguredError("offline")
 
 
-def make_settings(tmp_path: Path) -> Settings:
-    return Settings.model_validate(
-        {
-            "OPENAI_API_KEY": "",
-            "TELEGRAM_BOT_TOKEN": "",
-            "DMK_DB_PATH": str(tmp_path / "router.sqlite3"),
-            "DMK_DEFAULT_MODE": "narrator",
-            "DMK_PROFANITY_LEVEL": 2,
-            "DMK_RATING": "PG-13",
-            "DMK_MODEL": "gpt-4o-mini",
-            "DMK_TANGENTS_LEVEL": 1,
-            "DMK_ACHIEVEMENT_DENSITY": "normal",
+class FakeStore:
+    """No-database stand-in covering the store calls of a narrator turn."""
+
+    # Same defaults as the sessions table columns.
+    _SESSION_DEFAULTS = {
+        "mode": "narrator",
+        "profanity_level": 3,
+        "rating": "PG-13",
+        "tangents_level": 1,
+        "achievement_density": "normal",
+        "story_mode_enabled": False,
+    }
+
+    def ensure_user(self, user_id: str, display_name: Optional[str] = None) -> None:
+        return None
+
+    def upsert_session(self, session_id: str, user_id: str, **fields: Any) -> SessionState:
+        now = datetime.now(timezone.utc)
+        values = {
+            key: default if fields.get(key) is None else fields[key]
+            for key, default in self._SESSION_DEFAULTS.items()
         }
-    )
+        return SessionState(id=session_id, user_id=user_id, created_at=now, updated_at=now, **values)
+
+    def fetch_latest_grant(self, *_: object, **__: object) -> None:
+        return None
+
+    def fetch_latest_grant_any_session(self, *_: object) -> None:
+        return None
+
+    def fetch_most_recent_for_user(self, _user_id: str) -> None:
+        return None
+
+    def log_achievement(
+        self,
+        achievement_id: str,
+        user_id: str,
+        session_id: Optional[str],
+        rarity: str,
+        detail: Optional[dict[str, Any]] = None,
+    ) -> AchievementGrant:
+        return AchievementGrant(
+            id=1,
+            achievement_id=achievement_id,
+            user_id=user_id,
+            session_id=session_id,
+            rarity=rarity,
+            awarded_at=datetime.now(timezone.utc),
+            detail=detail or {},
+        )
+
+
+# Validated once; tests only swap in their own database path.
+_BASE_SETTINGS = Settings.model_validate(
+    {
+        "OPENAI_API_KEY": "",
+        "TELEGRAM_BOT_TOKEN": "",
+        "DMK_DB_PATH": "router.sqlite3",
+        "DMK_DEFAULT_MODE": "narrator",
+        "DMK_PROFANITY_LEVEL": 2,
+        "DMK_RATING": "PG-13",
+        "DMK_MODEL": "gpt-4o-mini",
+        "DMK_TANGENTS_LEVEL": 1,
+        "DMK_ACHIEVEMENT_DENSITY": "normal",
+    }
+)
 
 
-def make_store(settings: Settings) -> SQLiteStore:
-    store = SQLiteStore(db_path=settings.db_path_obj)
-    store.migrate()
-    return store
+def make_settings(tmp_path: Path) -> Settings:
+    return _BASE_SETTINGS.model_copy(update={"db_path": str(tmp_path / "router.sqlite3")})
 
 
-def test_mode_router_happy_path(tmp_path) -> None:
+def test_mode_router_happy_path(tmp_path, store: SQLiteStore) -> None:
     settings = make_settings(tmp_path)
-    store = make_store(settings)
     agent = FakeAgent("Paragraph one.\n\nParagraph two.")
     router = ModeRouter(store=store, agent=agent, settings=settings)
     request = ModeRequest(
@@ -65,8 +118,7 @@ def test_mode_router_happy_path(tmp_path) -> None:
 
 def test_mode_router_offline_fallback(tmp_path) -> None:
     settings = make_settings(tmp_path)
-    store = make_store(settings)
-    router = ModeRouter(store=store, agent=FailAgent(), settings=settings)
+    router = ModeRouter(store=FakeStore(), agent=FailAgent(), settings=settings)  # type: ignore[arg-type]
     request = ModeRequest(
         user_id="user-2",
         session_id="session-2",
@@ -79,9 +131,8 @@ def test_mode_router_offline_fallback(tmp_path) -> None:
     assert "uplink" in response.text or "oracle" in response.text
 
 
-def test_story_mode_requires_finalize(tmp_path) -> None:
+def test_story_mode_requires_finalize(tmp_path, store: SQLiteStore) -> None:
     settings = make_settings(tmp_path)
-    store = make_store(settings)
     agent = FakeAgent("Story paragraph.")
     router = ModeRouter(store=store, agent=agent, settings=settings)
 
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import gc
+import sqlite3
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from src.engine.storage import SQLiteStore
+from src.engine.storage import sqlite as sqlite_module
+
+
+def test_close_forgets_seen_users() -> None:
+    store = SQLiteStore.in_memory()
+    store.migrate()
+    store.ensure_user("user-1")
+    store.close()
+
+    # Reconnecting to ":memory:" starts from an empty database.
+    store.migrate()
+    store.ensure_user("user-1")
+    session = store.upsert_session("session-1", "user-1")
+    assert session.user_id == "user-1"
+    store.close()
+
+
+_INSERT_GRANT = """
+    INSERT INTO achievement_grants (achievement_id, user_id, session_id, rarity, detail)
+    VALUES (?, ?, ?, 'common', '{}')
+"""
+
+
+def _seed(store: SQLiteStore, user_id: str = "user-1", session_id: str = "session-1") -> None:
+    # Seed on the writer connection directly so the writer thread isn't started yet.
+    store.connect().execute("INSERT INTO users (id) VALUES (?)", (user_id,))
+    store.upsert_session(session_id, user_id)
+
+
+def test_commit_batch_isolates_a_failing_statement(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    futures = [Future() for _ in range(3)]
+    memory_store._commit_batch(
+        [
+            (_INSERT_GRANT, ("first", "user-1", "session-1"), futures[0]),
+            (_INSERT_GRANT, ("orphan", "missing-user", "session-1"), futures[1]),
+            (_INSERT_GRANT, ("third", "user-1", "session-1"), futures[2]),
+        ]
+    )
+
+    assert isinstance(futures[1].exception(), sqlite3.IntegrityError)
+    assert futures[0].result() < futures[2].result()
+    rows = memory_store.connect().execute(
+        "SELECT achievement_id FROM achievement_grants ORDER BY id"
+    ).fetchall()
+    assert [row[0] for row in rows] == ["first", "third"]
+
+
+def test_writer_batches_queued_writes_in_order(
+    memory_store: SQLiteStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _seed(memory_store)
+    batch_sizes: list[int] = []
+    commit_batch = memory_store._commit_batch
+
+    def record(batch: list) -> None:
+        batch_sizes.append(len(batch))
+        commit_batch(batch)
+
+    monkeypatch.setattr(memory_store, "_commit_batch", record)
+    # Give the writer time to pick up the write queued after it starts.
+    monkeypatch.setattr(sqlite_module, "COMMIT_DELAY_SEC", 0.2)
+    # Queued before the writer thread exists, so they share its first batch.
+    futures = [Future() for _ in range(3)]
+    for index, future in enumerate(futures):
+        memory_store._write_queue.put((_INSERT_GRANT, (f"queued-{index}", "user-1", "session-1"), future))
+    last_id = memory_store._enqueue_write(_INSERT_GRANT, ("last", "user-1", "session-1"))
+
+    assert batch_sizes == [4]
+    assert [future.result() for future in futures] + [last_id] == sorted(
+        [future.result() for future in futures] + [last_id]
+    )
+
+
+def test_write_error_reaches_the_caller(memory_store: SQLiteStore) -> None:
+    with pytest.raises(sqlite3.IntegrityError):
+        memory_store.log_achievement("orphan", "missing-user", "missing-session", "common")
+    # The writer keeps serving later writes.
+    _seed(memory_store)
+    grant = memory_store.log_achievement("ok", "user-1", "session-1", "common")
+    assert memory_store.fetch_most_recent_for_user("user-1") == grant
+
+
+def test_writer_stops_when_unclosed_store_is_collected() -> None:
+    store = SQLiteStore.in_memory()
+    store.migrate()
+    store.ensure_user("user-1")
+    writer = store._writer
+    assert writer is not None and writer.is_alive()
+
+    del store
+    gc.collect()
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+
+
+def test_json_columns_accept_non_string_keys(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    profile = memory_store.upsert_story_profile(
+        "session-1", "user-1", inventory={1: "rope"}, metadata={"slots": {2: "torch"}}
+    )
+
+    assert profile.inventory == {"1": "rope"}
+    assert memory_store.get_story_profile("session-1").metadata == {"slots": {"2": "torch"}}
+
+
+def test_grant_detail_round_trips_through_json(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    memory_store.log_achievement("ok", "user-1", "session-1", "common", {"rolls": {1: 20}})
+
+    raw = memory_store.connect().execute("SELECT detail FROM achievement_grants").fetchone()[0]
+    assert raw == b'{"rolls":{"1":20}}'
+    grant = memory_store.fetch_most_recent_for_user("user-1")
+    assert grant.detail == {"rolls": {"1": 20}}
+
+
+def test_grant_detail_reads_msgpack_rows_with_json_keys(memory_store: SQLiteStore) -> None:
+    msgpack = pytest.importorskip("msgpack")
+    _seed(memory_store)
+    memory_store.connect().execute(
+        """
+        INSERT INTO achievement_grants (achievement_id, user_id, session_id, rarity, detail)
+        VALUES ('packed', 'user-1', 'session-1', 'common', ?)
+        """,
+        (msgpack.packb({"rolls": {1: 20, 2: 3}, "note": "crit"}),),
+    )
+
+    grant = memory_store.fetch_most_recent_for_user("user-1")
+    assert grant.detail == {"rolls": {"1": 20, "2": 3}, "note": "crit"}
+
+
+def test_grant_detail_reads_legacy_text_json(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    memory_store.connect().execute(
+        """
+        INSERT INTO achievement_grants (achievement_id, user_id, session_id, rarity, detail)
+        VALUES ('legacy', 'user-1', 'session-1', 'common', '{"rolls":[4,5]}')
+        """
+    )
+
+    assert memory_store.fetch_most_recent_for_user("user-1").detail == {"rolls": [4, 5]}
+
+
+def test_failed_commit_rolls_back_the_write_transaction(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    with pytest.raises(sqlite3.IntegrityError):
+        with memory_store._write_tx() as conn:
+            conn.execute("PRAGMA defer_foreign_keys = ON")
+            conn.execute(_INSERT_GRANT, ("orphan", "missing-user", "session-1"))
+
+    assert not memory_store.connect().in_transaction
+    session = memory_store.upsert_session("session-1", "user-1", mode="story")
+    assert session.mode == "story"
+
+
+def test_session_cache_follows_writes(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    assert memory_store.get_session("session-1").mode == "narrator"
+
+    memory_store.upsert_session("session-1", "user-1", mode="story")
+
+    assert memory_store.get_session("session-1").mode == "story"
+
+
+def test_noop_upsert_keeps_updated_at_unless_forced(store: SQLiteStore) -> None:
+    conn = store.connect()
+    conn.execute("INSERT INTO users (id) VALUES ('user-1')")
+    conn.execute(
+        """
+        INSERT INTO sessions (id, user_id, created_at, updated_at)
+        VALUES ('session-1', 'user-1', '2000-01-01 00:00:00', '2000-01-01 00:00:00')
+        """
+    )
+
+    unchanged = store.upsert_session("session-1", "user-1", mode="narrator")
+    assert unchanged.updated_at == unchanged.created_at
+
+    forced = store.upsert_session("session-1", "user-1", mode="narrator", force=True)
+    assert forced.updated_at > forced.created_at
+
+
+def test_upserts_return_what_a_fresh_read_sees(store: SQLiteStore) -> None:
+    _seed(store)
+    session = store.upsert_session("session-1", "user-1", rating="R")
+    state = store.upsert_story_state("session-1", current_scene="gate", flags={"lit": True})
+
+    fresh = SQLiteStore(db_path=store.path)
+    try:
+        assert fresh.get_session("session-1") == session
+        assert fresh.get_story_state("session-1") == state
+    finally:
+        fresh.close()
+
+
+def test_scene_history_reads_delimited_and_legacy_rows(memory_store: SQLiteStore) -> None:
+    _seed(memory_store)
+    memory_store.upsert_session("session-2", "user-1")
+    state = memory_store.upsert_story_state("session-1", scene_history=["gate", "hall"])
+    memory_store.connect().execute(
+        """
+        INSERT INTO story_state (session_id, scene_history, flags, stats)
+        VALUES ('session-2', '["cave","river"]', '{}', '{}')
+        """
+    )
+
+    raw = memory_store.connect().execute(
+        "SELECT scene_history FROM story_state WHERE session_id = 'session-1'"
+    ).fetchone()[0]
+    assert raw == "gate\x1fhall"
+    assert state.scene_history == ("gate", "hall")
+    assert memory_store.get_story_state("session-2").scene_history == ("cave", "river")
+
+
+def test_in_memory_stores_are_private() -> None:
+    first = SQLiteStore.in_memory()
+    second = SQLiteStore.in_memory()
+    try:
+        first.migrate()
+        second.migrate()
+        _seed(first)
+
+        assert first.get_session("session-1") is not None
+        assert second.get_session("session-1") is None
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.parametrize("scene_id", ["1", "007"])
+def test_scene_history_keeps_numeric_scene_ids(memory_store: SQLiteStore, scene_id: str) -> None:
+    _seed(memory_store)
+    state = memory_store.upsert_story_state(
+        "session-1", current_scene=scene_id, scene_history=[scene_id]
+    )
+
+    assert state.scene_history == (scene_id,)
+    memory_store._story_state_cache.clear()
+    assert memory_store.get_story_state("session-1").scene_history == (scene_id,)
+
+
+def test_scene_history_reads_numeric_values_from_json_columns(tmp_path: Path) -> None:
+    path = tmp_path / "legacy.sqlite3"
+    conn = sqlite3.connect(path)
+    # The column declaration used before scene_history became TEXT.
+    conn.execute(
+        """
+        CREATE TABLE story_state (
+            session_id TEXT PRIMARY KEY,
+            current_scene TEXT,
+            scene_history JSON,
+            flags JSON,
+            stats JSON,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.close()
+    store = SQLiteStore(db_path=path)
+    try:
+        store.migrate()
+        _seed(store)
+        state = store.upsert_story_state("session-1", current_scene="1", scene_history=["1"])
+
+        assert state.scene_history == ("1",)
+        store._story_state_cache.clear()
+        assert store.get_story_state("session-1").scene_history == ("1",)
+    finally:
+        store.close()
@@ -6,14 +6,15 @@ from pathlib import Path
 import pytest
 
 from src.engine.character import CharacterManager
-from src.engine.story import StoryEngine
+from src.engine.story import StoryEngine, runtime
 from src.engine.storage import SQLiteStore
 
+try:
+    from orjson import dumps as _dumps
+except ImportError:  # pragma: no cover - optional speedup
 
-def make_store(tmp_path: Path) -> SQLiteStore:
-    store = SQLiteStore(db_path=tmp_path / "story.sqlite3")
-    store.migrate()
-    return store
+    def _dumps(value: object) -> bytes:
+        return json.dumps(value).encode("utf-8")
 
 
 def build_campaign(tmp_path: Path) -> Path:
@@ -44,24 +45,28 @@ def build_campaign(tmp_path: Path) -> Path:
         ],
     }
     path = tmp_path / "campaign.json"
-    path.write_text(json.dumps(data))
+    path.write_bytes(_dumps(data))
     return path
 
 
-def test_auto_check_inferred_from_tags(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    store = make_store(tmp_path)
+def test_auto_check_inferred_from_tags(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, store: SQLiteStore
+) -> None:
     campaign_path = build_campaign(tmp_path)
     engine = StoryEngine(store, campaign_path=campaign_path)
 
     manager = CharacterManager(store)
     session_id = "session-auto"
     user_id = "user-auto"
+    store.ensure_user(user_id)
+    store.upsert_session(session_id, user_id)
     profile = manager.ensure_profile(session_id, user_id)
     manager.update_basic_field(session_id, user_id, character_name="Carl", race="Human", character_class="Crawler")
     manager.set_ability_score(session_id, user_id, "cha", 18)
     profile = manager.ensure_profile(session_id, user_id)
 
-    monkeypatch.setattr("src.engine.story.runtime.random.randint", lambda _a, _b: 15)
+    # roll_die draws 5 bits for a d20 and adds one.
+    monkeypatch.setattr(runtime.random, "getrandbits", lambda _k: 14)
 
     result = engine.process_turn(session_id, user_id, profile, "1")
     assert result is not None
@@ -69,3 +74,24 @@ def test_auto_check_inferred_from_tags(tmp_path: Path, monkeypatch: pytest.Monke
     assert result.check_outcome is not None
     assert result.check_outcome.ability == "cha"
     assert result.metadata["check"]["auto"] is True
+
+
+def test_match_choice_prefers_earlier_label_over_later_id(tmp_path: Path, store: SQLiteStore) -> None:
+    choices = [
+        {"id": "open_door", "label": "Sneak past the guard", "next_scene": "intro"},
+        {"id": "sneak", "label": "Run for it", "next_scene": "intro"},
+        {"id": "wait", "label": "Wait", "next_scene": "intro"},
+    ]
+    data = {
+        "campaign": "Precedence",
+        "root_scene": "intro",
+        "scenes": [{"id": "intro", "title": "Hall", "narration": [], "choices": choices}],
+    }
+    campaign_path = tmp_path / "campaign.json"
+    campaign_path.write_bytes(_dumps(data))
+    engine = StoryEngine(store, campaign_path=campaign_path)
+    scene = engine._campaign.scenes["intro"]
+
+    assert engine._match_choice("sneak", scene).id == "open_door"
+    assert engine._match_choice("wait", scene).id == "wait"
+    assert engine._match_choice("/choose 2", scene).id == "sneak"
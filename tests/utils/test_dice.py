@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from src.utils.dice import DiceParseError, parse_dice_expression, roll_instruction
+import random
+
+import pytest
+
+from src.utils.dice import DiceParseError, parse_dice_expression, roll_die, roll_instruction
 
 
 def test_parse_basic_dice() -> None:
@@ -32,11 +36,56 @@ def test_invalid_expression_raises() -> None:
     raise AssertionError("Expected DiceParseError")
 
 
+def test_roll_die_single_side_always_rolls_one() -> None:
+    assert {roll_die(1) for _ in range(20)} == {1}
+
+
+def test_roll_die_power_of_two_covers_every_face() -> None:
+    rng = random.Random(3)
+    faces = {roll_die(8, rng) for _ in range(500)}
+    assert faces == set(range(1, 9))
+
+
+def test_roll_die_seeded_sequence_is_repeatable() -> None:
+    first_rng, second_rng = random.Random(42), random.Random(42)
+    first = [roll_die(20, first_rng) for _ in range(50)]
+    second = [roll_die(20, second_rng) for _ in range(50)]
+    assert first == second
+    assert all(1 <= value <= 20 for value in first)
+
+
+def test_zero_sided_dice_raise_value_error() -> None:
+    with pytest.raises(ValueError):
+        roll_die(0)
+    with pytest.raises(ValueError):
+        roll_instruction(parse_dice_expression("2d0"))
+
+
+def test_roll_instruction_accepts_randint_only_rng() -> None:
+    rng = _CountingRng()
+    many = roll_instruction(parse_dice_expression("2d6"), rng=rng)
+    one = roll_instruction(parse_dice_expression("1d6+1"), rng=rng)
+    assert many.rolls == [3, 3]
+    assert one.total == 4
+    assert rng.calls == [(1, 6)] * 3
+
+
+class _CountingRng:
+    """RNG stand-in that only implements randint, always rolling a 3."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+
+    def randint(self, a: int, b: int) -> int:
+        self.calls.append((a, b))
+        return 3
+
+
 class _FixedRng:
     """Deterministic RNG returning preset d20 rolls."""
 
     def __init__(self) -> None:
-        self.values = [5, 12]
+        self.values = iter([5, 12])
 
     def randint(self, _a: int, _b: int) -> int:
-        return self.values.pop(0)
+        return next(self.values)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 
 from src.engine.achievements import load_registry
@@ -9,12 +10,13 @@ from src.engine.achievements import load_registry
 
 def main() -> None:
     registry = load_registry()
-    print(f"Loaded {len(registry)} achievements from registry.json")  # noqa: T201
-    for achievement in registry:
-        triggers = ", ".join(achievement.triggers)
-        print(  # noqa: T201
-            f"- {achievement.id} [{achievement.rarity}] triggers: {triggers}"
-        )
+    # One write for the whole listing instead of a print per achievement.
+    lines = [f"Loaded {len(registry)} achievements from registry.json"]
+    lines.extend(
+        f"- {achievement.id} [{achievement.rarity}] triggers: {', '.join(achievement.triggers)}"
+        for achievement in registry
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
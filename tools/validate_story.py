@@ -2,51 +2,152 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional, Sequence
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
-def validate_campaign(path: Path) -> list[str]:
-    errors: list[str] = []
-    data = json.loads(path.read_text(encoding="utf-8"))
-    scenes = {scene["id"]: scene for scene in data.get("scenes", [])}
+try:
+    import fastjsonschema  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    fastjsonschema = None  # type: ignore[assignment]
+
+# Both parse UTF-8 bytes directly, so files are never decoded to str first.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Shape the story engine relies on when indexing a campaign. Cross-references
+# between scenes can't be expressed here and are checked in validate_campaign.
+CAMPAIGN_SCHEMA = {
+    "type": "object",
+    "required": ["root_scene", "scenes"],
+    "properties": {
+        "campaign": {"type": "string"},
+        "root_scene": {"type": "string"},
+        "scenes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "title": {"type": "string"},
+                    "narration": {"type": "array", "items": {"type": "string"}},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                    "choices": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["id", "label", "next_scene"],
+                            "properties": {
+                                "id": {"type": "string"},
+                                "label": {"type": "string"},
+                                "next_scene": {"type": "string"},
+                                "xp_reward": {"type": "integer"},
+                                "tags": {"type": "array", "items": {"type": "string"}},
+                                "check": {
+                                    "type": "object",
+                                    "required": ["ability"],
+                                    "properties": {
+                                        "ability": {"type": "string"},
+                                        "dc": {"type": "integer"},
+                                        "success_scene": {"type": "string"},
+                                        "failure_scene": {"type": "string"},
+                                        "success_xp": {"type": "integer"},
+                                        "failure_xp": {"type": "integer"},
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Compiled once per process into specialised Python code.
+_validate_schema = fastjsonschema.compile(CAMPAIGN_SCHEMA) if fastjsonschema is not None else None
+
+
+def iter_errors(path: Path) -> Iterator[str]:
+    """Yield validation errors for one campaign file as they are found."""
+    data = _json_loads(path.read_bytes())
+    if _validate_schema is not None:
+        try:
+            _validate_schema(data)
+        except fastjsonschema.JsonSchemaException as exc:
+            yield f"Schema error in {path.name}: {exc.message}"
+            return
+    scenes = data.get("scenes", [])
+    # Only membership is needed for cross-references, not the scene dicts.
+    scene_ids = frozenset(scene["id"] for scene in scenes)
     root = data.get("root_scene")
-    if root not in scenes:
-        errors.append(f"Root scene '{root}' missing in {path.name}")
+    if root not in scene_ids:
+        yield f"Root scene '{root}' missing in {path.name}"
 
-    for scene in scenes.values():
+    for scene in scenes:
         for choice in scene.get("choices", []):
             target = choice.get("next_scene")
-            if target not in scenes:
-                errors.append(
-                    f"Choice '{choice.get('id')}' in scene '{scene['id']}' targets missing scene '{target}'"
-                )
+            if target not in scene_ids:
+                yield f"Choice '{choice.get('id')}' in scene '{scene['id']}' targets missing scene '{target}'"
             check = choice.get("check")
             if check:
                 for field in ("success_scene", "failure_scene"):
                     target_scene = check.get(field)
-                    if target_scene and target_scene not in scenes:
-                        errors.append(
+                    if target_scene and target_scene not in scene_ids:
+                        yield (
                             f"Check {field} '{target_scene}' missing (scene '{scene['id']}', choice '{choice.get('id')}')"
                         )
-    return errors
 
 
-def main() -> None:
+def validate_campaign(path: Path) -> list[str]:
+    return list(iter_errors(path))
+
+
+def _iter_campaign_errors(paths: list[Path]) -> Iterator[str]:
+    if len(paths) <= 1:
+        # A single file isn't worth the cost of starting worker processes.
+        for path in paths:
+            yield from iter_errors(path)
+        return
+    # Files are independent and parsing is CPU-bound. Workers return lists
+    # because generators can't cross the process boundary.
+    with ProcessPoolExecutor() as executor:
+        try:
+            for file_errors in executor.map(validate_campaign, paths, chunksize=8):
+                yield from file_errors
+        finally:
+            # Drop queued files when the caller stops early (--fail-fast).
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fail-fast", action="store_true", help="stop at the first error")
+    args = parser.parse_args(argv)
+
     base = Path("assets/story")
     if not base.exists():
         print("No story assets found.")
         sys.exit(0)
 
-    errors: list[str] = []
-    for path in base.rglob("*.json"):
-        errors.extend(validate_campaign(path))
+    failed = False
+    for err in _iter_campaign_errors(list(base.rglob("*.json"))):
+        if not failed:
+            print("Story validation failed:")
+            failed = True
+        print(f" - {err}")
+        if args.fail_fast:
+            break
 
-    if errors:
-        print("Story validation failed:")
-        for err in errors:
-            print(f" - {err}")
+    if failed:
         sys.exit(1)
 
     print("All story campaigns look consistent.")